@@ -14,10 +14,28 @@ from urllib.parse import urlparse
 import aiofiles
 import aiohttp
 
+from src.helpers.http_session import get_shared_session
 from src.logging import LOGGER
 
 logger = LOGGER(__name__)
 
+COOKIES_DIR = "cookies"
+# Upper bound on pastes fetched at once, so a long URL list can't open a
+# socket per entry or let one slow host hold up the rest
+MAX_CONCURRENT_FETCHES = 16
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the pooled session shared by every cookie refresh."""
+    return get_shared_session(
+        "cookie fetch",
+        timeout=aiohttp.ClientTimeout(total=30),
+        limit=32,
+        limit_per_host=8,
+        ttl_dns_cache=300,
+        use_dns_cache=True,
+    )
+
 
 async def fetch_content(session: aiohttp.ClientSession, url: str) -> str | None:
     paste_id = url.strip("/").split("/")[-1]
@@ -47,17 +65,24 @@ async def save_bin_content(session: aiohttp.ClientSession, url: str) -> str | No
         .split("#")[0]
     )
     filename += ".txt"
-    filepath = os.path.join("cookies", filename)
+    filepath = os.path.join(COOKIES_DIR, filename)
 
     content = await fetch_content(session, url)
+    if not content:
+        return None
 
-    content = base64.b64decode(content + "==").decode("utf-8")
+    # Pastes are stored without base64 padding; add only what is missing
+    content = content.strip()
+    try:
+        decoded = base64.b64decode(content + "=" * (-len(content) % 4))
+    except ValueError as e:
+        logger.error(f"Invalid base64 content from {url}: {e}")
+        return None
 
-    if content:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    if decoded:
         try:
-            async with aiofiles.open(filepath, "w") as f:
-                await f.write(content)
+            async with aiofiles.open(filepath, "wb") as f:
+                await f.write(decoded)
             return filepath
         except Exception as e:
             logger.error(f"Error saving file {filepath}: {e}")
@@ -67,8 +92,20 @@ async def save_bin_content(session: aiohttp.ClientSession, url: str) -> str | No
 
 async def save_all_cookies(cookie_urls: list[str]) -> list[str]:
     """Processes multiple URLs concurrently and returns saved file paths."""
-    async with aiohttp.ClientSession() as session:
-        tasks = [save_bin_content(session, url) for url in cookie_urls]
-        results = await asyncio.gather(*tasks)
+    os.makedirs(COOKIES_DIR, exist_ok=True)
+    session = _get_session()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+    async def _bounded(url: str) -> str | None:
+        async with semaphore:
+            return await save_bin_content(session, url)
+
+    results = await asyncio.gather(
+        *(_bounded(url) for url in cookie_urls), return_exceptions=True
+    )
+
+    for url, res in zip(cookie_urls, results):
+        if isinstance(res, BaseException):
+            logger.error(f"Error saving cookies from {url}: {res}")
 
-    return [res for res in results if res]
+    return [res for res in results if isinstance(res, str)]
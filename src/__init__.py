@@ -8,7 +8,7 @@
 import logging as log
 import sys
 import time
-from asyncio import get_event_loop, new_event_loop, set_event_loop
+from asyncio import new_event_loop, set_event_loop, set_event_loop_policy
 
 import uvloop
 from keep_alive_ping import KeepAliveService
@@ -33,7 +33,9 @@ service = KeepAliveService(
 )
 
 
-uvloop.install()
+# uvloop.install() is deprecated; setting the policy makes every loop
+# created from here on a uvloop one
+set_event_loop_policy(uvloop.EventLoopPolicy())
 LOGGER(__name__).info("Starting Quick DL....")
 BotStartTime = time.time()
 
@@ -50,11 +52,11 @@ You MUST need to be on python 3.7 or above, shutting down the bot...
 
 
 LOGGER(__name__).info("setting up event loop....")
-try:
-    loop = get_event_loop()
-except RuntimeError:
-    set_event_loop(new_event_loop())
-    loop = get_event_loop()
+# Create the loop outright instead of probing get_event_loop(), which is
+# deprecated outside a running loop. The bot needs one long-lived loop
+# (Client and bot.run() pick it up), so it is not wrapped in uvloop.run().
+loop = new_event_loop()
+set_event_loop(loop)
 
 LOGGER(__name__).info("setting up pinger for keep alive ....")
 
@@ -7,12 +7,15 @@
 
 import asyncio
 import json
+import re
+from dataclasses import dataclass
 from os import getenv
 from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
 
+from src.helpers.json_utils import json_loads
 from src.logging import LOGGER
 
 logger = LOGGER(__name__)
@@ -23,7 +26,7 @@ env_loaded = False
 
 for env_file in env_files:
     if Path(env_file).exists():
-        logger.info(f"Loading environment from {env_file}")
+        logger.info("Loading environment from %s", env_file)
         load_dotenv(env_file)
         env_loaded = True
         break
@@ -35,22 +38,20 @@ if not env_loaded:
 # Helper function to handle both direct env vars and .env format
 def parse_json_env(key, default=None):
     value = getenv(key, "")
-    logger.debug(f"Raw value for {key}: {repr(value)}")  # Show exact string with quotes
+    logger.debug("Raw value for %s: %r", key, value)  # Show exact string with quotes
 
     if not value:
-        logger.debug(f"No value found for {key}, using default")
+        logger.debug("No value found for %s, using default", key)
         return default if default is not None else []
 
     # Clean up the value
     value = value.strip()
 
-    # Check if it looks like JSON
-    if (value.startswith("[") and value.endswith("]")) or (
-        value.startswith("{") and value.endswith("}")
-    ):
+    # Check if it looks like JSON: wrapped in [] or {}
+    if value[:1] + value[-1:] in ("[]", "{}"):
         try:
-            parsed = json.loads(value)
-            logger.debug(f"Successfully parsed {key}: {parsed}")
+            parsed = json_loads(value)
+            logger.debug("Successfully parsed %s: %s", key, parsed)
             return parsed
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse {key}: {e}")
@@ -64,78 +65,116 @@ def parse_json_env(key, default=None):
         return [value]  # Return as single string item
 
 
-# Load configuration
-RAPID_API_KEYS = parse_json_env("RAPID_API_KEYS")
-STORAGE_CHANNEL_ID: int = int(getenv("STORAGE_CHANNEL_ID", "-1003011035251"))
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Settings read from the environment once at import."""
 
-API_ID = int(getenv("API_ID", 0))
-API_HASH = getenv("API_HASH", "")
-BOT_TOKEN = getenv("BOT_TOKEN", "")
-GITHUB_REPO = "RKgroupkg/Telegram-AllDlp-Bot"  # <-- replace with your actual username/repo name
+    api_id: int
+    api_hash: str
+    bot_token: str
+    mongo_uri: str
+    storage_channel_id: int
+    rapid_api_keys: list
+    owner_userid: tuple
+    sudo_userid: tuple  # owners first, then extra sudo users
 
+    # YT config
+    cookie_rotation_cooldown: int
+    default_cookies_dir: str
+    yt_progress_update_interval: int
+    catch_path: str
+    max_video_length_minutes: int
+    ytdl_fragment_concurrency: int
+    yt_info_db_path: str
 
-# YT config
-COOKIE_ROTATION_COOLDOWN: int = int(getenv("COOKIE_ROTATION_COOLDOWN", "600"))
-DEFAULT_COOKIES_DIR: str = getenv("DEFAULT_COOKIES_DIR", "./cookies")
-YT_PROGRESS_UPDATE_INTERVAL: int = int(getenv("YT_PROGRESS_UPDATE_INTERVAL", "5"))
-CATCH_PATH: str = getenv("CATCH_PATH", "./tmp")
-MAX_VIDEO_LENGTH_MINUTES: int = int(getenv("MAX_VIDEO_LENGTH_MINUTES", "15"))
+    spotify_client_id: str
+    spotify_client_secret: str
 
-SPOTIFY_CLIENT_ID: str = getenv("SPOTIFY_CLIENT_ID", "")
-SPOTIFY_CLIENT_SECRET: str = getenv("SPOTIFY_CLIENT_SECRET", "")
+    # Render
+    render_api_key: str
+    service_id: str
 
-# Render
-RENDER_API_KEY = getenv("RENDER_API_KEY", "")
-SERVICE_ID = getenv("SERVICE_ID", "")
 
+def _load() -> Config:
+    # Handle owner and sudo users
+    try:
+        owner_userid = parse_json_env("OWNER_USERID", [])
+    except Exception as error:
+        logger.error(f"Failed to parse OWNER_USERID: {error}")
+        owner_userid = []
 
-# Helper function to handle both direct env vars and .env format
-def parse_json_env(key, default=None):
-    value = getenv(key, "")
-    if not value:
-        return default if default is not None else []
+    sudo_userid = list(owner_userid)
+    try:
+        sudo_users = parse_json_env("SUDO_USERID", [])
+        if sudo_users:
+            sudo_userid += sudo_users
+            logger.info("Added sudo user(s)")
+    except Exception:
+        logger.info("No sudo user(s) mentioned in config.")
+
+    return Config(
+        api_id=int(getenv("API_ID", 0)),
+        api_hash=getenv("API_HASH", ""),
+        bot_token=getenv("BOT_TOKEN", ""),
+        mongo_uri=getenv("MONGO_URI", ""),
+        storage_channel_id=int(getenv("STORAGE_CHANNEL_ID", "-1003011035251")),
+        rapid_api_keys=parse_json_env("RAPID_API_KEYS"),
+        # Ensure unique user IDs, keeping owners ahead of sudo users
+        owner_userid=tuple(dict.fromkeys(owner_userid)),
+        sudo_userid=tuple(dict.fromkeys(sudo_userid)),
+        cookie_rotation_cooldown=int(getenv("COOKIE_ROTATION_COOLDOWN", "600")),
+        default_cookies_dir=getenv("DEFAULT_COOKIES_DIR", "./cookies"),
+        yt_progress_update_interval=int(getenv("YT_PROGRESS_UPDATE_INTERVAL", "5")),
+        catch_path=getenv("CATCH_PATH", "./tmp"),
+        max_video_length_minutes=int(getenv("MAX_VIDEO_LENGTH_MINUTES", "15")),
+        # Parallel fragment downloads per video, kept modest to avoid per-IP throttling
+        ytdl_fragment_concurrency=min(
+            max(int(getenv("YTDL_FRAGMENT_CONCURRENCY", "4")), 1), 8
+        ),
+        # SQLite file that keeps extracted video info across restarts
+        yt_info_db_path=getenv("YT_INFO_DB_PATH", "./cache/yt_info.sqlite3"),
+        spotify_client_id=getenv("SPOTIFY_CLIENT_ID", ""),
+        spotify_client_secret=getenv("SPOTIFY_CLIENT_SECRET", ""),
+        render_api_key=getenv("RENDER_API_KEY", ""),
+        service_id=getenv("SERVICE_ID", ""),
+    )
 
-    # Clean up the value (remove extra spaces, etc.)
-    value = value.strip()
 
-    # Check if it's already a valid JSON string
-    if (value.startswith("[") and value.endswith("]")) or (
-        value.startswith("{") and value.endswith("}")
-    ):
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            pass
+# Load configuration
+CONFIG = _load()
 
-    # Try to interpret as a single value
-    try:
-        # For a single integer
-        return [int(value)]
-    except ValueError:
-        # If not an integer, return as a single string item
-        return [value]
-
-
-# Handle owner and sudo users
-try:
-    OWNER_USERID = parse_json_env("OWNER_USERID", [])
-    SUDO_USERID = OWNER_USERID.copy()
-except Exception as error:
-    logger.error(f"Failed to parse OWNER_USERID: {error}")
-    OWNER_USERID = []
-    SUDO_USERID = []
-
-try:
-    sudo_users = parse_json_env("SUDO_USERID", [])
-    if sudo_users:
-        SUDO_USERID += sudo_users
-        logger.info("Added sudo user(s)")
-except Exception:
-    logger.info("No sudo user(s) mentioned in config.")
-
-# Ensure unique user IDs
-SUDO_USERID = list(set(SUDO_USERID))
-MONGO_URI = getenv("MONGO_URI", "")
+# Module-level names kept for existing `from src.config import ...` users
+RAPID_API_KEYS = CONFIG.rapid_api_keys
+STORAGE_CHANNEL_ID: int = CONFIG.storage_channel_id
+
+API_ID = CONFIG.api_id
+API_HASH = CONFIG.api_hash
+BOT_TOKEN = CONFIG.bot_token
+GITHUB_REPO = "RKgroupkg/Telegram-AllDlp-Bot"  # <-- replace with your actual username/repo name
+
+
+# YT config
+COOKIE_ROTATION_COOLDOWN: int = CONFIG.cookie_rotation_cooldown
+DEFAULT_COOKIES_DIR: str = CONFIG.default_cookies_dir
+YT_PROGRESS_UPDATE_INTERVAL: int = CONFIG.yt_progress_update_interval
+CATCH_PATH: str = CONFIG.catch_path
+MAX_VIDEO_LENGTH_MINUTES: int = CONFIG.max_video_length_minutes
+YTDL_FRAGMENT_CONCURRENCY: int = CONFIG.ytdl_fragment_concurrency
+YT_INFO_DB_PATH: str = CONFIG.yt_info_db_path
+
+SPOTIFY_CLIENT_ID: str = CONFIG.spotify_client_id
+SPOTIFY_CLIENT_SECRET: str = CONFIG.spotify_client_secret
+
+# Render
+RENDER_API_KEY = CONFIG.render_api_key
+SERVICE_ID = CONFIG.service_id
+
+OWNER_USERID = list(CONFIG.owner_userid)
+SUDO_USERID = list(CONFIG.sudo_userid)
+# Use these for `user_id in ...` checks
+OWNER_USERID_SET = frozenset(OWNER_USERID)
+SUDO_USERID_SET = frozenset(SUDO_USERID)
+MONGO_URI = CONFIG.mongo_uri
 
 # Validate essential configuration
 if not API_ID or not API_HASH or not BOT_TOKEN:
@@ -148,15 +187,15 @@ if not MONGO_URI:
     logger.warning("MONGO_URI not specified, some features may be unavailable")
 
 
+# COOKIES_URL entries may be separated by commas, whitespace or both
+_COOKIE_URL_SPLIT = re.compile(r"[,\s]+")
+
+
 def process_cookie_urls(env_value: Optional[str]) -> list[str]:
     """Parse COOKIES_URL environment variable"""
     if not env_value:
         return []
-    urls = []
-    for part in env_value.split(","):
-        urls.extend(part.split())
-
-    return [url.strip() for url in urls if url.strip()]
+    return [url for url in _COOKIE_URL_SPLIT.split(env_value) if url]
 
 
 if getenv("COOKIES_URL", ""):
@@ -166,9 +205,12 @@ if getenv("COOKIES_URL", ""):
     logger.info("Processing cookies from urls")
     from cookies._cookies.fetchCookies import save_all_cookies
 
-    loop = asyncio.get_event_loop()
+    # Nothing is running yet at import; get_event_loop() would only create a
+    # loop implicitly (deprecated, and an error on newer Pythons). Left open
+    # so the fetcher's session can still be closed on it at exit.
+    loop = asyncio.new_event_loop()
     result = loop.run_until_complete(save_all_cookies(COOKIES_URL))
-    logger.info(f"Cookies got: {result}")
+    logger.info("Cookies got: %s", result)
 
 else:
     COOKIES_URL = None
@@ -9,6 +9,8 @@ import sys
 from typing import Union
 
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.write_concern import WriteConcern
 
 from src.config import MONGO_URI
 from src.logging import LOGGER
@@ -78,6 +80,27 @@ class MongoDB:
             {"_id": document_id}, updated_data, upsert=True
         )
 
+    async def update_documents(
+        self, updates: dict, write_concern: WriteConcern = None
+    ) -> None:
+        """
+        Upsert many documents in one round-trip, keyed by mongodb document_id.
+        Pass write_concern to override the client's default for this batch.
+        """
+
+        if not updates:
+            return
+        collection = self.collection
+        if write_concern is not None:
+            collection = collection.with_options(write_concern=write_concern)
+        await collection.bulk_write(
+            [
+                UpdateOne({"_id": document_id}, {"$set": data}, upsert=True)
+                for document_id, data in updates.items()
+            ],
+            ordered=False,
+        )
+
     async def delete_document(self, document_id: Union[str, int]) -> None:
         """Delete the document using document_id using mongodb document_id from collection."""
 
@@ -105,8 +128,16 @@ async def check_mongo_uri(MONGO_URI: str) -> None:
         sys.exit(1)
 
 
-# Initiating MongoDb motor client
-mongodb = AsyncIOMotorClient(MONGO_URI)
+# Initiating MongoDb motor client, shared by every collection below.
+# The pool is sized for bursts of handler writes; a request waiting longer
+# than waitQueueTimeoutMS for a connection fails instead of queueing forever.
+mongodb = AsyncIOMotorClient(
+    MONGO_URI,
+    maxPoolSize=50,
+    minPoolSize=5,
+    waitQueueTimeoutMS=2000,
+    serverSelectionTimeoutMS=3000,
+)
 
 # Database Name (src).
 database = mongodb.src
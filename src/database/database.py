@@ -5,12 +5,56 @@
 #
 #
 
+import asyncio
 from datetime import datetime
 from typing import Union
 
+from pymongo.write_concern import WriteConcern
 from pyrogram.types import Message
 
-from src.database.MongoDb import chats, users
+from src.database.MongoDb import MongoDB, chats, users
+from src.logging import LOGGER
+
+# Writes arriving within this window go out together as one bulk_write
+WRITE_FLUSH_DELAY = 0.01  # seconds
+
+# Pending upserts per collection, keyed by document id so repeat events
+# for the same user/chat inside one window collapse into a single op
+_pending_writes: dict = {}
+_flush_handles: dict = {}
+_flush_tasks: set = set()
+
+# Last-seen bookkeeping only needs the primary's ack, even if the URI
+# asks for w=majority
+_SAVE_WRITE_CONCERN = WriteConcern(w=1)
+
+
+def _queue_update(
+    collection: MongoDB, document_id: Union[int, str], data: dict
+) -> None:
+    _pending_writes.setdefault(collection, {})[document_id] = data
+    if collection not in _flush_handles:
+        _flush_handles[collection] = asyncio.get_running_loop().call_later(
+            WRITE_FLUSH_DELAY, _start_flush, collection
+        )
+
+
+def _start_flush(collection: MongoDB) -> None:
+    _flush_handles.pop(collection, None)
+    batch = _pending_writes.pop(collection, None)
+    if not batch:
+        return
+    task = asyncio.create_task(_flush(collection, batch))
+    # Keep a reference so the task isn't garbage collected mid-write
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_tasks.discard)
+
+
+async def _flush(collection: MongoDB, batch: dict) -> None:
+    try:
+        await collection.update_documents(batch, _SAVE_WRITE_CONCERN)
+    except Exception as e:
+        LOGGER(__name__).error(f"Failed to save {len(batch)} document(s): {e}")
 
 
 async def save_user(user: Message) -> None:
@@ -22,11 +66,11 @@ async def save_user(user: Message) -> None:
         "date": datetime.now(),
     }
 
-    return await users.update_document(user.id, insert_format)
+    _queue_update(users, user.id, insert_format)
 
 
 async def save_chat(chatid: Union[int, str]) -> None:
     """Save the new chat id in the database if it is not already there."""
 
     insert_format = {"date": datetime.now()}
-    return await chats.update_document(chatid, insert_format)
+    _queue_update(chats, chatid, insert_format)
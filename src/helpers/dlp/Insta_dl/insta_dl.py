@@ -5,25 +5,49 @@
 #
 #
 
-import http.client
+import asyncio
+import heapq
+import itertools
 import json
+import math
 import os
 import random
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import quote
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
+import aiohttp
+
+from src.helpers.dlp._rex import INSTAGRAM_URL_RE
+from src.helpers.http_session import get_shared_session
+from src.helpers.json_utils import json_loads
 from src.logging import LOGGER
 
+# Resolved once; log calls below pass %-args so disabled levels skip formatting
+logger = LOGGER(__name__)
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the pooled session shared by every RapidAPI lookup."""
+    # Lookups are bursty but sparse; hold idle connections longer than
+    # aiohttp's 15s default so the next one skips the TLS handshake
+    return get_shared_session(
+        "Instagram API", limit=50, ttl_dns_cache=300, keepalive_timeout=60
+    )
 
-@dataclass
+
+@dataclass(slots=True)
 class APIKey:
     key: str
     host: str
     remaining_requests: int = 100
-    reset_time: Optional[float] = None
+    reset_time: Optional[float] = None  # time.monotonic() deadline
     is_active: bool = True
+    headers: Dict[str, str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Constant per key, so built once rather than on every request
+        self.headers = {"x-rapidapi-key": self.key, "x-rapidapi-host": self.host}
 
 
 class InstagramDownloader:
@@ -33,48 +57,67 @@ class InstagramDownloader:
         max_retries: int = 3,
         retry_delay: int = 2,
         timeout: int = 30,
+        max_backoff: float = 30,
     ):
         self.api_keys = [APIKey(key=k["key"], host=k["host"]) for k in api_keys]
         if not self.api_keys:
             raise ValueError("At least one API key is required")
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
         self.timeout = timeout
-        self.current_key_index = 0
-        LOGGER(__name__).info(f"Initialized with {len(self.api_keys)} API keys")
+        # Min-heap of (available_at, -remaining, order, key): the top is the
+        # usable key with the most quota left; entries are refreshed lazily
+        # when they reach the top, and `order` rotates between equal keys.
+        self._order = itertools.count()
+        self._heap = [self._heap_entry(key) for key in self.api_keys]
+        heapq.heapify(self._heap)
+        logger.info("Initialized with %d API keys", len(self.api_keys))
+
+    def _heap_entry(self, key: APIKey) -> Tuple[float, int, int, APIKey]:
+        if key.reset_time:
+            available_at = key.reset_time
+        elif key.remaining_requests > 0:
+            available_at = 0.0
+        else:
+            # Out of quota with no reset announced; never picked again
+            available_at = math.inf
+        return (available_at, -key.remaining_requests, next(self._order), key)
 
-    def _get_next_available_key(self) -> Optional[APIKey]:
-        start_index = self.current_key_index
-        current_time = time.time()
-        for key in self.api_keys:
+    async def _get_next_available_key(self) -> Optional[APIKey]:
+        heap = self._heap
+        while heap:
+            current_time = time.monotonic()
+            top = heap[0]
+            key = top[-1]
             if key.reset_time and key.reset_time <= current_time:
                 key.remaining_requests = 100
                 key.reset_time = None
                 key.is_active = True
-        for _ in range(len(self.api_keys)):
-            self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-            key = self.api_keys[self.current_key_index]
-            if key.is_active and key.remaining_requests > 0:
+            if not key.is_active:
+                heapq.heappop(heap)
+                continue
+            entry = self._heap_entry(key)
+            if entry[:2] != top[:2]:
+                # Status changed since the entry was pushed; re-rank and retry
+                heapq.heapreplace(heap, entry)
+                continue
+            if entry[0] <= current_time:
+                heapq.heapreplace(heap, entry)
                 return key
-            if self.current_key_index == start_index:
+            wait_time = entry[0] - current_time
+            if wait_time > 10:
                 break
-        next_reset = min(
-            (k.reset_time for k in self.api_keys if k.reset_time), default=None
-        )
-        if next_reset:
-            wait_time = next_reset - current_time
-            if wait_time <= 10:
-                LOGGER(__name__).info(
-                    f"All keys at limit, waiting {wait_time:.2f}s for reset"
-                )
-                time.sleep(wait_time + 0.5)
-                return self._get_next_available_key()
-        LOGGER(__name__).warning("No available API keys found")
+            logger.info("All keys at limit, waiting %.2fs for reset", wait_time)
+            await asyncio.sleep(wait_time + 0.5)
+        logger.warning("No available API keys found")
         return None
 
     def _update_key_status(
-        self, key: APIKey, headers: Dict[str, str], status_code: int
+        self, key: APIKey, headers: Mapping[str, str], status_code: int
     ):
+        # `headers` is the response's own case-insensitive mapping; read it
+        # in place rather than copying it into a dict first
         remaining = headers.get("x-ratelimit-requests-remaining") or headers.get(
             "x-ratelimit-remaining"
         )
@@ -82,72 +125,67 @@ class InstagramDownloader:
             try:
                 key.remaining_requests = int(remaining)
             except ValueError:
-                LOGGER(__name__).warning(
-                    f"Invalid remaining requests value: {remaining}"
-                )
+                logger.warning("Invalid remaining requests value: %s", remaining)
         if status_code == 429:
             reset_after = headers.get("x-ratelimit-reset") or headers.get("retry-after")
             if reset_after:
                 try:
                     reset_seconds = float(reset_after)
-                    key.reset_time = time.time() + reset_seconds
+                    key.reset_time = time.monotonic() + reset_seconds
                     key.remaining_requests = 0
-                    LOGGER(__name__).info(
-                        f"API key rate limited, will reset after {reset_seconds}s"
+                    logger.info(
+                        "API key rate limited, will reset after %ss", reset_seconds
                     )
                 except ValueError:
-                    key.reset_time = time.time() + 300
+                    key.reset_time = time.monotonic() + 300
                     key.remaining_requests = 0
             else:
-                key.reset_time = time.time() + 60
+                key.reset_time = time.monotonic() + 60
                 key.remaining_requests = 0
         elif status_code >= 400:
             key.remaining_requests = max(0, key.remaining_requests - 1)
             if status_code >= 500:
                 pass
             elif status_code in (401, 403):
-                LOGGER(__name__).error(
-                    f"API key authentication failed: {key.key[:5]}..."
-                )
+                logger.error("API key authentication failed: %s...", key.key[:5])
                 key.is_active = False
 
-    def _make_request(self, endpoint: str, url: str) -> Tuple[Optional[Dict], int]:
-        api_key = self._get_next_available_key()
+    async def _make_request(
+        self, endpoint: str, url: str
+    ) -> Tuple[Optional[Dict], int]:
+        api_key = await self._get_next_available_key()
         if not api_key:
-            LOGGER(__name__).error("No available API keys to make request")
+            logger.error("No available API keys to make request")
             return None, 0
-        encoded_url = quote(url, safe="")
-        conn = http.client.HTTPSConnection(api_key.host, timeout=self.timeout)
-        headers = {"x-rapidapi-key": api_key.key, "x-rapidapi-host": api_key.host}
-        full_endpoint = f"/{endpoint}?url={encoded_url}"
         try:
-            LOGGER(__name__).debug(f"Making request to {api_key.host}{full_endpoint}")
-            conn.request("GET", full_endpoint, headers=headers)
-            response = conn.getresponse()
-            status_code = response.status
-            self._update_key_status(api_key, dict(response.getheaders()), status_code)
-            if status_code == 200:
-                data = response.read().decode("utf-8")
-                try:
-                    return json.loads(data), status_code
-                except json.JSONDecodeError:
-                    LOGGER(__name__).error("Failed to parse JSON response")
+            logger.debug("Making request to %s/%s", api_key.host, endpoint)
+            async with _get_session().get(
+                f"https://{api_key.host}/{endpoint}",
+                params={"url": url},
+                headers=api_key.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            ) as response:
+                status_code = response.status
+                self._update_key_status(api_key, response.headers, status_code)
+                if status_code == 200:
+                    try:
+                        # Parse the raw bytes; skips aiohttp's decode-to-str step
+                        return json_loads(await response.read()), status_code
+                    except json.JSONDecodeError:
+                        logger.error("Failed to parse JSON response")
+                        return None, status_code
+                else:
+                    logger.warning("Request failed with status code: %s", status_code)
                     return None, status_code
-            else:
-                LOGGER(__name__).warning(
-                    f"Request failed with status code: {status_code}"
-                )
-                return None, status_code
         except Exception as e:
-            LOGGER(__name__).error(f"Request error: {str(e)}")
+            logger.error("Request error: %s", e)
             return None, 0
-        finally:
-            conn.close()
 
-    def download(self, url: str) -> Dict[str, Any]:
-        LOGGER(__name__).info(f"Downloading content from: {url}")
+    async def download(self, url: str) -> Dict[str, Any]:
+        logger.info("Downloading content from: %s", url)
+        prev_delay = self.retry_delay
         for attempt in range(1, self.max_retries + 1):
-            response_data, status_code = self._make_request("post-dl", url)
+            response_data, status_code = await self._make_request("post-dl", url)
             if (
                 response_data
                 and status_code == 200
@@ -155,41 +193,65 @@ class InstagramDownloader:
             ):
                 data = response_data.get("data", {})
                 if data:
-                    LOGGER(__name__).info(f"Successfully retrieved data for {url}")
+                    logger.info("Successfully retrieved data for %s", url)
                     return data
                 else:
-                    LOGGER(__name__).warning("No data found in response")
+                    logger.warning("No data found in response")
                     return {}
             else:
-                LOGGER(__name__).warning(
-                    f"Attempt {attempt} failed with status {status_code}"
-                )
+                logger.warning("Attempt %d failed with status %s", attempt, status_code)
             if attempt < self.max_retries:
-                delay = self.retry_delay * (2 ** (attempt - 1))
-                jitter = random.uniform(0, 0.5 * delay)
-                LOGGER(__name__).info(
-                    f"Retrying in {delay + jitter:.2f}s (attempt {attempt}/{self.max_retries})"
+                # Decorrelated jitter: uniform in [retry_delay, 3 * previous],
+                # capped so later attempts can't balloon past max_backoff
+                delay = min(
+                    self.max_backoff,
+                    self.retry_delay
+                    + random.random() * (prev_delay * 3 - self.retry_delay),
                 )
-                time.sleep(delay + jitter)
-        LOGGER(__name__).error(f"Failed to download after {self.max_retries} attempts")
+                prev_delay = delay
+                logger.info(
+                    "Retrying in %.2fs (attempt %d/%d)",
+                    delay,
+                    attempt,
+                    self.max_retries,
+                )
+                await asyncio.sleep(delay)
+        logger.error("Failed to download after %d attempts", self.max_retries)
         return {}
 
 
-def get_instagram_post_data(
+def _load_env_keys() -> List[Dict[str, str]]:
+    env_keys = os.environ.get("INSTAGRAM_API_KEYS")
+    if not env_keys:
+        return []
+    try:
+        return json_loads(env_keys)
+    except json.JSONDecodeError:
+        logger.error("Invalid INSTAGRAM_API_KEYS environment variable format")
+        return []
+
+
+# Fallback keys, parsed once at import instead of on every lookup
+_ENV_KEYS = _load_env_keys()
+
+# Reused across calls so per-key rate-limit state survives between posts
+_downloader: Optional[InstagramDownloader] = None
+_downloader_keys: Optional[List[Dict[str, str]]] = None
+
+
+async def get_instagram_post_data(
     post_url: str, api_keys: Optional[List[Dict[str, str]]] = None
 ) -> Dict[str, Any]:
-    if not api_keys:
-        env_keys = os.environ.get("INSTAGRAM_API_KEYS")
-        if env_keys:
-            try:
-                api_keys = json.loads(env_keys)
-            except json.JSONDecodeError:
-                LOGGER(__name__).error(
-                    "Invalid INSTAGRAM_API_KEYS environment variable format"
-                )
-                api_keys = []
-    downloader = InstagramDownloader(api_keys)
-    return downloader.download(post_url)
+    global _downloader, _downloader_keys
+    # Reject anything that isn't a post/reel link before spending API quota
+    if not INSTAGRAM_URL_RE.match(post_url):
+        logger.warning("Not an Instagram post URL: %s", post_url)
+        return {}
+    api_keys = api_keys or _ENV_KEYS
+    if _downloader is None or api_keys != _downloader_keys:
+        _downloader = InstagramDownloader(api_keys)
+        _downloader_keys = api_keys
+    return await _downloader.download(post_url)
 
 
 if __name__ == "__main__":
@@ -200,5 +262,5 @@ if __name__ == "__main__":
         }
     ]
     post_url = "https://www.instagram.com/p/CqIbCzYMi5C/"
-    post_data = get_instagram_post_data(post_url, api_keys)
+    post_data = asyncio.run(get_instagram_post_data(post_url, api_keys))
     print(post_data)
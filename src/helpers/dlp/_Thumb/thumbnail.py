@@ -6,14 +6,29 @@
 import asyncio
 import os
 import uuid
+from collections import OrderedDict
 from typing import Dict, Optional, Tuple
 
 import aiohttp
 
+from src.helpers.http_session import get_shared_session
 from src.logging import LOGGER
 
 logger = LOGGER(__name__)
 
+# Thumbnails mostly come from a handful of CDN hosts, so one pooled session
+# lets consecutive fetches reuse keep-alive connections and cached DNS.
+def _get_session() -> aiohttp.ClientSession:
+    """Return the pooled session shared by every thumbnail fetch."""
+    return get_shared_session(
+        "thumbnail",
+        timeout=aiohttp.ClientTimeout(total=10),
+        limit=32,
+        limit_per_host=8,
+        ttl_dns_cache=300,
+        keepalive_timeout=30,
+    )
+
 
 class ThumbnailManager:
     def __init__(self, cache_dir: str = "/tmp", cache_size: int = 100):
@@ -25,8 +40,15 @@ class ThumbnailManager:
             cache_size: Maximum number of thumbnails to cache in memory
         """
         self.cache_dir = cache_dir
+        self.cache_size = cache_size
         self._ensure_cache_dir()
-        self.thumbnails: Dict[str, str] = {}  # url -> filepath mapping
+        # url -> filepath, least recently used first
+        self.thumbnails: "OrderedDict[str, str]" = OrderedDict()
+        # url -> running download, shared by concurrent requests for one URL
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # filepath -> callers that got it and haven't deleted it yet; the
+        # file is only unlinked once the last of them lets go
+        self._holders: Dict[str, int] = {}
 
     def _ensure_cache_dir(self):
         """Ensure cache directory exists"""
@@ -49,16 +71,40 @@ class ThumbnailManager:
             return False, None
 
         # Check if we already have this thumbnail
-        if thumbnail_url in self.thumbnails:
-            filepath = self.thumbnails[thumbnail_url]
+        filepath = self.thumbnails.get(thumbnail_url)
+        if filepath is not None:
             if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
                 logger.debug(f"Using cached thumbnail: {filepath}")
+                self.thumbnails.move_to_end(thumbnail_url)
+                self._hold(filepath)
                 return True, filepath
+            del self.thumbnails[thumbnail_url]
+
+        # Join a download already running for this URL, or start one
+        task = self._inflight.get(thumbnail_url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_cache(thumbnail_url))
+            self._inflight[thumbnail_url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(thumbnail_url, None))
+        # Shielded so one cancelled caller doesn't abort the others' download
+        success, filepath = await asyncio.shield(task)
+        if success:
+            self._hold(filepath)
+        return success, filepath
 
-        # Download new thumbnail
+    def _hold(self, filepath: str) -> None:
+        """Count one more caller using filepath."""
+        self._holders[filepath] = self._holders.get(filepath, 0) + 1
+
+    async def _fetch_and_cache(self, thumbnail_url: str) -> Tuple[bool, Optional[str]]:
+        """Download a thumbnail and record it, evicting the oldest past cache_size."""
         success, filepath = await self._download_thumbnail(thumbnail_url)
         if success:
             self.thumbnails[thumbnail_url] = filepath
+            # Evicting only forgets the mapping; the file stays until its
+            # holders delete it
+            while len(self.thumbnails) > self.cache_size:
+                self.thumbnails.popitem(last=False)
         return success, filepath
 
     async def _download_thumbnail(
@@ -80,33 +126,32 @@ class ThumbnailManager:
             retry_count = 3
             for attempt in range(retry_count):
                 try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(
-                            thumbnail_url, timeout=10, raise_for_status=True
-                        ) as response:
-                            content = await response.read()
-
-                            # Validate content
-                            if not content or len(content) < 100:
-                                logger.warning(
-                                    f"Downloaded thumbnail too small: {len(content)} bytes"
-                                )
-                                await asyncio.sleep(1)  # Wait before retry
-                                continue
-
-                            # Write to file
-                            with open(thumbnail_filename, "wb") as f:
-                                f.write(content)
-
-                            # Verify file
-                            if (
-                                os.path.exists(thumbnail_filename)
-                                and os.path.getsize(thumbnail_filename) > 0
-                            ):
-                                logger.info(
-                                    f"Successfully downloaded thumbnail to {thumbnail_filename}"
-                                )
-                                return True, thumbnail_filename
+                    async with _get_session().get(
+                        thumbnail_url, raise_for_status=True
+                    ) as response:
+                        content = await response.read()
+
+                        # Validate content
+                        if not content or len(content) < 100:
+                            logger.warning(
+                                f"Downloaded thumbnail too small: {len(content)} bytes"
+                            )
+                            await asyncio.sleep(1)  # Wait before retry
+                            continue
+
+                        # Write to file
+                        with open(thumbnail_filename, "wb") as f:
+                            f.write(content)
+
+                        # Verify file
+                        if (
+                            os.path.exists(thumbnail_filename)
+                            and os.path.getsize(thumbnail_filename) > 0
+                        ):
+                            logger.info(
+                                f"Successfully downloaded thumbnail to {thumbnail_filename}"
+                            )
+                            return True, thumbnail_filename
 
                 except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                     logger.warning(
@@ -127,7 +172,8 @@ class ThumbnailManager:
 
     def delete_thumbnail(self, thumbnail_path: Optional[str]) -> bool:
         """
-        Safely delete a thumbnail file and remove from cache.
+        Release a thumbnail; the file is deleted and dropped from the cache
+        once no other caller still holds it.
 
         Args:
             thumbnail_path: Path to the thumbnail file
@@ -138,6 +184,12 @@ class ThumbnailManager:
         if not thumbnail_path:
             return False
 
+        holders = self._holders.get(thumbnail_path, 0) - 1
+        if holders > 0:
+            self._holders[thumbnail_path] = holders
+            return False
+        self._holders.pop(thumbnail_path, None)
+
         # Remove from cache dict
         for url, path in list(self.thumbnails.items()):
             if path == thumbnail_path:
@@ -177,6 +229,7 @@ class ThumbnailManager:
                 deleted_count += 1
 
         self.thumbnails.clear()
+        self._holders.clear()
         return deleted_count
 
 
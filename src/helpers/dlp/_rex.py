@@ -1,4 +1,7 @@
 # File: src/helpers/dlp/_rex.py
+import re
+from typing import Optional
+
 YT_LINK_REGEX = (
     r"(?:https?:\/\/)?(?:www\.|m\.|music\.)?"
     + r"(?:youtube\.com\/(?:watch\?(?:.*&)?v=|shorts\/|playlist\?(?:.*&)?list=|"
@@ -25,3 +28,43 @@ LINK_REGEX_PATTERNS = [
     SPOTIFY_PLAYLIST_REGEX,
     INSTAGRAM_URL_PATTERN,
 ]
+
+# Compiled once here so handlers don't go through re's pattern cache per message
+YT_LINK_RE = re.compile(YT_LINK_REGEX)
+SPOTIFY_TRACK_RE = re.compile(SPOTIFY_TRACK_REGEX)
+SPOTIFY_ALBUM_RE = re.compile(SPOTIFY_ALBUM_REGEX)
+SPOTIFY_PLAYLIST_RE = re.compile(SPOTIFY_PLAYLIST_REGEX)
+INSTAGRAM_URL_RE = re.compile(INSTAGRAM_URL_PATTERN)
+URL_RE = re.compile(URL_REGEX)
+
+# All supported links fused into one pattern, so a message is scanned once
+# instead of once per pattern. Each source sits in a named group, which
+# `classify` reports via `lastgroup`.
+COMBINED_LINK_REGEX = re.compile(
+    "|".join(
+        f"(?P<{name}>{pattern})"
+        for name, pattern in (
+            ("youtube", YT_LINK_REGEX),
+            ("spotify_track", SPOTIFY_TRACK_REGEX),
+            ("spotify_album", SPOTIFY_ALBUM_REGEX),
+            ("spotify_playlist", SPOTIFY_PLAYLIST_REGEX),
+            ("instagram", INSTAGRAM_URL_PATTERN),
+        )
+    ),
+    re.IGNORECASE,
+)
+
+
+def classify(text: str) -> Optional[str]:
+    """
+    Identify the first supported link in the text.
+
+    Args:
+        text: Message text or URL to scan
+
+    Returns:
+        One of "youtube", "spotify_track", "spotify_album", "spotify_playlist"
+        or "instagram", or None if no supported link is present
+    """
+    match = COMBINED_LINK_REGEX.search(text)
+    return match.lastgroup if match else None
@@ -1,14 +1,14 @@
 # File: src/helpers/dlp/_util.py
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
+
+
 def format_size(size_bytes):
     """Format file size in human readable format"""
     if size_bytes < 1024:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes/1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes/(1024*1024):.1f} MB"
-    else:
-        return f"{size_bytes/(1024*1024*1024):.1f} GB"
+    # Each unit is 10 more bits, so bit_length picks it without a divide chain
+    unit = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << 10 * unit):.1f} {_SIZE_UNITS[unit]}"
 
 
 def format_time(seconds):
@@ -1,7 +1,9 @@
 # File: src/helpers/dlp/_yt_dlp.py
 import asyncio
+import functools
+import heapq
+import json
 import os
-import random
 import shutil
 import tempfile
 import time
@@ -11,11 +13,28 @@ from typing import Any, Callable, Coroutine, Dict, Optional
 
 from src.config import \
     COOKIE_ROTATION_COOLDOWN  # seconds between using the same cookie file
-from src.config import DEFAULT_COOKIES_DIR, YT_PROGRESS_UPDATE_INTERVAL
+from src.config import (DEFAULT_COOKIES_DIR, YT_INFO_DB_PATH,
+                        YT_PROGRESS_UPDATE_INTERVAL)
 from src.logging import LOGGER
 
 logger = LOGGER(__name__)
 
+# Shared layout for progress messages, filled by format_progress
+_PROGRESS_TEMPLATE = (
+    "**Downloading...**\n"
+    "Progress: {pct:.1f}% [{bar}]\n"
+    "Speed: {speed:.2f} MB/s\n"
+    "Downloaded: {dl:.2f}/{tot:.2f} MB\n"
+    "ETA: {eta}"
+)
+
+# Pre-rendered progress bars indexed by the number of filled cells
+_BAR_LENGTH = 10
+_BARS = ["▰" * i + "▱" * (_BAR_LENGTH - i) for i in range(_BAR_LENGTH + 1)]
+
+# Bytes -> MiB factor, applied as a multiplication in the progress path
+_MB = 1.0 / (1024 * 1024)
+
 
 # Cookie rotation management
 class CookieManager:
@@ -33,11 +52,55 @@ class CookieManager:
 
         self.cookies_dir = cookies_dir
         self.cookies_files = []
-        self.cookie_usage_history = {}
+        # Last-use timestamps survive restarts so cooldowns are honoured. Kept
+        # with the other runtime caches, outside the tracked cookies dir.
+        self._hist_path = os.path.join(
+            os.path.dirname(YT_INFO_DB_PATH) or ".", "cookie_usage.json"
+        )
+        self.cookie_usage_history = self._load_usage_history()
+        self._dirty = 0
+        self._dir_mtime = None
+        # Min-heap of (last_used, cookie_path); the root is the LRU cookie
+        self._heap = []
         self._lock = asyncio.Lock()
         self.refresh_cookies_list()
         self._initialized = True
 
+    def _load_usage_history(self) -> Dict[str, float]:
+        """Load persisted cookie usage timestamps, if any"""
+        try:
+            with open(self._hist_path, "r", encoding="utf-8") as f:
+                history = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cookie usage history: {e}")
+            return {}
+        return history if isinstance(history, dict) else {}
+
+    def _save_usage_history(self, history: Dict[str, float]):
+        """
+        Atomically write a snapshot of cookie usage timestamps to disk.
+        Blocking; run it in a worker thread.
+
+        Args:
+            history: Copy of cookie_usage_history taken under the lock
+        """
+        hist_dir = os.path.dirname(self._hist_path)
+        try:
+            os.makedirs(hist_dir, exist_ok=True)
+            # Unique temp name, so overlapping saves can't clobber each other
+            fd, tmp_path = tempfile.mkstemp(dir=hist_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(history, f)
+                os.replace(tmp_path, self._hist_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to save cookie usage history: {e}")
+
     def fix_cookie_file(self, input_file, output_file):
         """Fix cookie file by ensuring tab separation in cookie entries."""
         for line in input_file:
@@ -74,13 +137,34 @@ class CookieManager:
                             f"Warning: invalid line in {input_file.name}: {line.strip()}"
                         )
 
-    def refresh_cookies_list(self):
-        """Refresh the list of available cookie files"""
+    def refresh_cookies_list(self, force: bool = False):
+        """
+        Refresh the list of available cookie files
+
+        Args:
+            force: Rescan even if the cookies directory is unchanged
+        """
+        try:
+            dir_mtime = os.stat(self.cookies_dir).st_mtime
+        except OSError:
+            dir_mtime = None
+
+        # Nothing was added, removed or renamed since the last scan
+        if (
+            not force
+            and self.cookies_files
+            and dir_mtime is not None
+            and dir_mtime == self._dir_mtime
+        ):
+            return
+
         self.cookies_files = []
-        if os.path.isdir(self.cookies_dir):
-            for file in os.listdir(self.cookies_dir):
-                if file.endswith(".txt"):
-                    cookie_path = os.path.join(self.cookies_dir, file)
+        if dir_mtime is not None:
+            with os.scandir(self.cookies_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".txt") or not entry.is_file():
+                        continue
+                    cookie_path = entry.path
 
                     with open(cookie_path, "r", encoding="utf-8") as input_file:
                         with tempfile.NamedTemporaryFile(
@@ -92,13 +176,23 @@ class CookieManager:
                     logger.info(f"Processed {cookie_path}")
 
                     # Verify the file is readable and not empty
-                    if os.path.getsize(cookie_path) > 0:
+                    if os.stat(cookie_path).st_size > 0:
                         self.cookies_files.append(cookie_path)
 
+            # Rewriting the files above touches the directory, so read it last
+            self._dir_mtime = os.stat(self.cookies_dir).st_mtime
+
         # Add the root cookies.txt if it exists and is not empty
         if os.path.exists("cookies.txt") and os.path.getsize("cookies.txt") > 0:
             self.cookies_files.append("cookies.txt")
 
+        # Rebuild the rotation heap, keeping what we know about past usage
+        self._heap = [
+            (self.cookie_usage_history.get(cookie, 0), cookie)
+            for cookie in self.cookies_files
+        ]
+        heapq.heapify(self._heap)
+
         logger.info(f"Found {len(self.cookies_files)} valid cookie files")
 
     async def refresh_cookies(self):
@@ -111,7 +205,7 @@ class CookieManager:
         """
         async with self._lock:
             # Refresh the cookies list
-            self.refresh_cookies_list()
+            self.refresh_cookies_list(force=True)
 
             # Log the refresh operation
             logger.info(
@@ -125,49 +219,34 @@ class CookieManager:
         async with self._lock:
             now = time.time()
 
-            # If no cookies available, return None
+            # Pick up added or removed cookie files; only a stat() unless the
+            # cookies directory changed since the last scan
+            self.refresh_cookies_list()
             if not self.cookies_files:
-                # Try refreshing once more in case new cookies were added
-                self.refresh_cookies_list()
-                if not self.cookies_files:
-                    logger.warning("No cookie files available")
-                    return None
-
-            # Filter cookies that aren't in cooldown
-            available_cookies = [
-                cookie
-                for cookie in self.cookies_files
-                if now - self.cookie_usage_history.get(cookie, 0)
-                >= COOKIE_ROTATION_COOLDOWN
-            ]
-
-            # If all cookies are in cooldown, use the least recently used one
-            if not available_cookies:
-                cookie = min(
-                    self.cookies_files,
-                    key=lambda x: self.cookie_usage_history.get(x, 0),
-                )
+                logger.warning("No cookie files available")
+                return None
+
+            # The least recently used cookie is the first to leave cooldown
+            last_used, cookie = self._heap[0]
+            if now - last_used < COOKIE_ROTATION_COOLDOWN:
                 logger.debug(
                     f"All cookies in cooldown, using least recently used: {os.path.basename(cookie)}"
                 )
-            else:
-                cookie = random.choice(available_cookies)
+            heapq.heapreplace(self._heap, (now, cookie))
 
-            # Update usage history
+            # Update usage history, flushing it to disk every few picks
             self.cookie_usage_history[cookie] = now
+            self._dirty += 1
+            snapshot = (
+                dict(self.cookie_usage_history) if self._dirty % 5 == 0 else None
+            )
             logger.debug(f"Using cookie file: {os.path.basename(cookie)}")
-            return cookie
-
 
-def get_or_create_eventloop():
-    """Get the current event loop or create a new one for the current thread"""
-    try:
-        return asyncio.get_event_loop()
-    except RuntimeError:
-        # If there's no event loop in this thread, create one
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        return loop
+        # Written off the loop once the lock is released, so other picks
+        # never wait on disk I/O
+        if snapshot is not None:
+            await asyncio.to_thread(self._save_usage_history, snapshot)
+        return cookie
 
 
 class DownloadTracker:
@@ -181,12 +260,19 @@ class DownloadTracker:
         self.callback = callback
         self.interval = interval
         self.last_update_time = 0
-        self.start_time = time.time()
+        # Seeded just before now so elapsed time is never zero
+        self.start_time = time.monotonic() - 1e-9
         self.progress_data = {"status": "starting"}
+        self._last_downloaded = None
+        self.last_pct_bucket = -1
+        # Smoothed speed (bytes/s) and the sample it was last updated from
+        self._ema_speed = 0.0
+        self._last_sample_time = self.start_time
+        self._last_sample_bytes = 0
 
     async def update(self, progress: Dict[str, Any]):
         """Update progress and potentially trigger callback"""
-        now = time.time()
+        now = time.monotonic()
         status = progress.get("status", "")
 
         # Update our data
@@ -198,12 +284,30 @@ class DownloadTracker:
             return
 
         # Update based on time interval
-        if now - self.last_update_time >= self.interval:
-            await self.force_update()
+        if now - self.last_update_time < self.interval:
+            return
+
+        # Skip ticks where the transfer stalled or stayed in the same percent
+        downloaded = self.progress_data.get("downloaded_bytes")
+        if downloaded == self._last_downloaded:
+            return
+        total = self.progress_data.get("total_bytes") or 0
+        if total > 0 and downloaded is not None:
+            if downloaded * 100 // total == self.last_pct_bucket:
+                return
+
+        await self.force_update()
 
     async def force_update(self):
         """Force a progress update"""
-        self.last_update_time = time.time()
+        self.last_update_time = time.monotonic()
+        downloaded = self.progress_data.get("downloaded_bytes")
+        total = self.progress_data.get("total_bytes") or 0
+        self._last_downloaded = downloaded
+        if total > 0 and downloaded is not None:
+            self.last_pct_bucket = downloaded * 100 // total
+        if downloaded is not None:
+            self._update_speed(downloaded)
 
         # Format the progress data
         if (
@@ -214,6 +318,7 @@ class DownloadTracker:
                 self.progress_data.get("downloaded_bytes", 0),
                 self.progress_data.get("total_bytes", 0),
                 self.start_time,
+                speed_override=self._ema_speed or None,
             )
             update_data = {
                 **self.progress_data,
@@ -228,6 +333,20 @@ class DownloadTracker:
         except Exception as e:
             logger.error(f"Error in progress callback: {str(e)}")
 
+    def _update_speed(self, downloaded: int):
+        """Fold the speed since the last render into the moving average"""
+        now = time.monotonic()
+        delta_t = now - self._last_sample_time
+        if delta_t <= 0:
+            return
+        speed = (downloaded - self._last_sample_bytes) / delta_t
+        if speed >= 0:
+            self._ema_speed = (
+                0.7 * self._ema_speed + 0.3 * speed if self._ema_speed else speed
+            )
+        self._last_sample_time = now
+        self._last_sample_bytes = downloaded
+
 
 class DownloadPool:
     """Manages concurrent downloads to limit system resources"""
@@ -245,38 +364,53 @@ class DownloadPool:
             return
 
         self.max_concurrent = max_concurrent
-        self.semaphore = asyncio.Semaphore(max_concurrent)
-        self.executor = ThreadPoolExecutor(max_workers=max_concurrent)
+        self.semaphore = asyncio.BoundedSemaphore(max_concurrent)
+        # More workers than slots: a job abandoned by wait_for() keeps its
+        # thread busy, and must not block the next job that gets a slot
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrent * 3, thread_name_prefix="ytdl"
+        )
+        # Downloads always run on the bot's main loop, resolved on first use
+        self._loop = None
         self._initialized = True
 
     async def run_download(self, fn, *args, **kwargs):
         """Run a download function with concurrency limits"""
         async with self.semaphore:
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(self.executor, fn, *args, **kwargs)
+            loop = self._loop or asyncio.get_running_loop()
+            self._loop = loop
+            return await loop.run_in_executor(
+                self.executor, functools.partial(fn, *args, **kwargs)
+            )
 
 
-async def format_progress(current: int, total: int, start_time: float) -> str:
+async def format_progress(
+    current: int,
+    total: int,
+    start_time: float,
+    speed_override: Optional[float] = None,
+) -> str:
     """
     Format download progress information
 
     Args:
         current: Current downloaded bytes
         total: Total bytes to download
-        start_time: Time when download started
+        start_time: time.monotonic() timestamp of when the download started
+        speed_override: Smoothed speed in bytes/s to use instead of the average
 
     Returns:
         Formatted progress string
     """
-    elapsed_time = time.time() - start_time
-    speed = current / elapsed_time if elapsed_time > 0 else 0
+    if speed_override is not None:
+        speed = speed_override
+    else:
+        elapsed_time = time.monotonic() - start_time
+        speed = current / elapsed_time if elapsed_time > 0 else 0
 
     percentage = current * 100 / total if total > 0 else 0
-    progress_bar_length = 10
-    completed_length = int(progress_bar_length * current / total) if total > 0 else 0
-    remaining_length = progress_bar_length - completed_length
-
-    progress_bar = "▰" * completed_length + "▱" * remaining_length
+    completed_length = int(_BAR_LENGTH * current / total) if total > 0 else 0
+    progress_bar = _BARS[max(0, min(completed_length, _BAR_LENGTH))]
 
     # Calculate ETA
     if speed > 0:
@@ -285,12 +419,15 @@ async def format_progress(current: int, total: int, start_time: float) -> str:
     else:
         eta_str = "Unknown"
 
-    return (
-        f"**Downloading...**\n"
-        f"Progress: {percentage:.1f}% [{progress_bar}]\n"
-        f"Speed: {speed / (1024 * 1024):.2f} MB/s\n"
-        f"Downloaded: {current / (1024 * 1024):.2f}/{total / (1024 * 1024):.2f} MB\n"
-        f"ETA: {eta_str}"
+    return _PROGRESS_TEMPLATE.format_map(
+        {
+            "pct": percentage,
+            "bar": progress_bar,
+            "speed": speed * _MB,
+            "dl": current * _MB,
+            "tot": total * _MB,
+            "eta": eta_str,
+        }
     )
 
 
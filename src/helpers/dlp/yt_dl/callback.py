@@ -4,6 +4,7 @@ import os
 import time
 import traceback
 from datetime import timedelta
+from typing import Coroutine, Dict, Set
 
 from pyrogram import Client
 from pyrogram.errors import FloodWait, MessageNotModified
@@ -14,12 +15,14 @@ from src.helpers.dlp._Thumb.thumbnail import (delete_thumbnail,
                                               download_and_verify_thumbnail)
 from src.helpers.dlp._util import format_size, format_time
 from src.helpers.dlp._yt_dlp import format_progress
+from src.helpers.functions import get_bot_username
 from src.logging import LOGGER
 
-from .catch import (add_video_info_to_cache, clean_expired_cache,
-                    get_callback_data, get_video_info_from_cache)
-from .dataclass import SearchInfo
-from .utils import create_format_selection_markup, extract_video_id
+from .catch import (add_video_info_to_cache, get_formats_view,
+                    get_video_info_from_cache)
+from .dataclass import FormatsView, SearchInfo
+from .utils import (CALLBACK_SEP, create_format_selection_markup,
+                    extract_video_id)
 from .ytdl_core import (MAX_VIDEO_LENGTH_MINUTES, beautify_views,
                         clean_temporary_file, download_youtube_video,
                         fetch_youtube_info)
@@ -37,6 +40,32 @@ download_queue = {}
 PROGRESS_UPDATE_INTERVAL = 3  # seconds
 MAX_RETRIES = 2
 STALLED_DOWNLOAD_TIMEOUT = 300  # 5 minutes
+MAX_CONCURRENT_DOWNLOADS = 4  # downloads (incl. upload) running at once
+
+# Slots shared by all users; a download waits here, not in the handler
+_download_slots = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+# Running download task per user
+_download_tasks: Dict[int, asyncio.Task] = {}
+# Users whose download task is still waiting for a slot
+_waiting_for_slot: Set[int] = set()
+
+
+def _spawn_download(user_id: int, coro: Coroutine) -> asyncio.Task:
+    """
+    Run a download in its own task so the update handler returns at once
+    and concurrent clicks from different users overlap.
+    """
+    task = asyncio.create_task(coro)
+    _download_tasks[user_id] = task
+
+    def _done(t: asyncio.Task) -> None:
+        if _download_tasks.get(user_id) is t:
+            del _download_tasks[user_id]
+        if not t.cancelled() and t.exception() is not None:
+            logger.error(f"Download task for user {user_id} failed: {t.exception()}")
+
+    task.add_done_callback(_done)
+    return task
 
 
 async def handle_youtube_link(client: Client, message: Message) -> None:
@@ -47,9 +76,6 @@ async def handle_youtube_link(client: Client, message: Message) -> None:
         client: Pyrogram client
         message: Message containing YouTube link
     """
-    # Run cache cleanup
-    clean_expired_cache()
-
     # Extract video ID
     video_id = extract_video_id(message.text)
     if not video_id:
@@ -104,7 +130,9 @@ async def handle_youtube_link(client: Client, message: Message) -> None:
             logger.info(f"Fetching info for video {video_id}")
             for attempt in range(MAX_RETRIES):
                 try:
-                    info = await fetch_youtube_info(video_id)
+                    info = await fetch_youtube_info(
+                        video_id, max_duration=MAX_VIDEO_LENGTH_MINUTES * 60
+                    )
                     if info:
                         if info.success:
                             add_video_info_to_cache(video_id, info)
@@ -141,13 +169,17 @@ async def handle_youtube_link(client: Client, message: Message) -> None:
         preferred_filter = user_preferences.get(user_id, {}).get("filter_type", "all")
 
         # Filter formats based on user preference
-        if preferred_filter == "video":
-            info.formats = info.combined_formats + info.video_formats
-        elif preferred_filter == "audio":
-            info.formats = info.audio_formats
+        view = get_formats_view(video_id, info)
+        if preferred_filter not in view._fields:
+            preferred_filter = "all"
 
         # Create format selection keyboard
-        markup = create_format_selection_markup(info.formats, page=0)
+        markup = create_format_selection_markup(
+            getattr(view, preferred_filter),
+            video_id=video_id,
+            page=0,
+            ftype=preferred_filter,
+        )
 
         # Update message with video information and format selection
         await processing_msg.edit_text(
@@ -189,20 +221,8 @@ async def handle_youtube_callback(
     callback_type = parts[0]
     callback_id = parts[1]
 
-    # Retrieve cached data for this callback
-    cached_data = get_callback_data(callback_id)
-    if not cached_data and callback_type not in ["ytcancel", "ytqueue"]:
-        logger.error(f"Callback data not found or expired: {callback_id}")
-        await callback_query.answer(
-            "⚠ This selection has expired. Please try again.", show_alert=True
-        )
-        try:
-            await message.edit_text(
-                "⚠ This selection has expired. Please request the YouTube link again."
-            )
-        except MessageNotModified:
-            pass
-        return
+    # The payload is packed into callback_data as "<video_id>|<field>"
+    fields = callback_id.split(CALLBACK_SEP)
 
     # Handle different callback types
     try:
@@ -214,6 +234,11 @@ async def handle_youtube_callback(
 
             if user_id_to_cancel in active_downloads:
                 active_downloads[user_id]["cancelled"] = True
+                # A job still queued for a slot never reaches the progress
+                # checks, so stop its task outright
+                task = _download_tasks.get(user_id_to_cancel)
+                if task is not None and user_id_to_cancel in _waiting_for_slot:
+                    task.cancel()
                 await message.edit_text("✖ Download cancelled.")
 
                 # Process next queued download if any
@@ -255,7 +280,7 @@ async def handle_youtube_callback(
             return
 
         elif callback_type == "ytinfo":
-            video_id = cached_data.get("video_id")
+            video_id = fields[0]
             info = get_video_info_from_cache(video_id)
             if not info:
                 await callback_query.answer(
@@ -277,8 +302,10 @@ async def handle_youtube_callback(
             return
 
         elif callback_type == "ytfilter":
-            video_id = cached_data.get("video_id")
-            filter_type = cached_data.get("filter_type")
+            if len(fields) != 2 or fields[1] not in FormatsView._fields:
+                await callback_query.answer("⚠ Invalid callback data", show_alert=True)
+                return
+            video_id, filter_type = fields
             page = 0  # Reset to first page when changing filters
 
             # Save user preference
@@ -293,16 +320,10 @@ async def handle_youtube_callback(
                 )
                 return
 
-            formats = {}
-            if filter_type == "all":
-                formats = info.all_formats
-            elif filter_type == "video":
-                formats = info.combined_formats + info.video_formats
-            elif filter_type == "audio":
-                formats = info.audio_formats
+            formats = getattr(get_formats_view(video_id, info), filter_type)
 
             markup = create_format_selection_markup(
-                formats, video_id=video_id, page=page
+                formats, video_id=video_id, page=page, ftype=filter_type
             )
 
             try:
@@ -313,8 +334,14 @@ async def handle_youtube_callback(
             return
 
         elif callback_type == "ytpage":
-            video_id = cached_data.get("video_id")
-            page = cached_data.get("page", 0)
+            if (
+                len(fields) != 3
+                or fields[1] not in FormatsView._fields
+                or not fields[2].isdigit()
+            ):
+                await callback_query.answer("⚠ Invalid callback data", show_alert=True)
+                return
+            video_id, filter_type, page = fields[0], fields[1], int(fields[2])
 
             info = get_video_info_from_cache(video_id)
             if not info:
@@ -323,7 +350,10 @@ async def handle_youtube_callback(
                 )
                 return
 
-            markup = create_format_selection_markup(info.formats, page=page)
+            formats = getattr(get_formats_view(video_id, info), filter_type)
+            markup = create_format_selection_markup(
+                formats, video_id=video_id, page=page, ftype=filter_type
+            )
 
             try:
                 await message.edit_reply_markup(reply_markup=markup)
@@ -333,9 +363,9 @@ async def handle_youtube_callback(
             return
 
         elif callback_type in ["ytbestVideo", "yt_best"]:
-            video_id = cached_data.get("video_id")
+            video_id = fields[0]
 
-            # Verify cached data exists and is valid
+            # Verify callback data is valid
             if not video_id:
                 await callback_query.answer("⚠ Invalid callback data", show_alert=True)
                 return
@@ -350,13 +380,22 @@ async def handle_youtube_callback(
             # Specific FLAC format handling
             format_id = "bestVideo"
 
-            await start_download(
-                client, callback_query, message, video_id, format_id, info, format_id
+            _spawn_download(
+                user_id,
+                start_download(
+                    client,
+                    callback_query,
+                    message,
+                    video_id,
+                    format_id,
+                    info,
+                    format_id,
+                ),
             )
         elif callback_type in ["ytflac", "yt_flac_filter"]:
-            video_id = cached_data.get("video_id")
+            video_id = fields[0]
 
-            # Verify cached data exists and is valid
+            # Verify callback data is valid
             if not video_id:
                 await callback_query.answer("⚠ Invalid callback data", show_alert=True)
                 return
@@ -371,18 +410,24 @@ async def handle_youtube_callback(
             # Specific FLAC format handling
             format_id = "flac"
 
-            await start_download(
-                client, callback_query, message, video_id, "flac", info, "flac"
+            _spawn_download(
+                user_id,
+                start_download(
+                    client, callback_query, message, video_id, "flac", info, "flac"
+                ),
             )
         elif callback_type == "ytdl":
+            if len(fields) != 2:
+                await callback_query.answer("⚠ Invalid callback data", show_alert=True)
+                return
+
             # Check if user already has an active download
             if (
                 user_id in active_downloads
                 and active_downloads[user_id]["expiry"] > time.time()
             ):
                 # Offer to queue this download instead
-                video_id = cached_data.get("video_id")
-                format_id = cached_data.get("format_id")
+                video_id, format_id = fields
 
                 queue_data = f"{video_id}:{format_id}"
                 queue_markup = InlineKeyboardMarkup(
@@ -405,8 +450,7 @@ async def handle_youtube_callback(
                     pass
                 return
 
-            video_id = cached_data.get("video_id")
-            format_id = cached_data.get("format_id")
+            video_id, format_id = fields
 
             info = get_video_info_from_cache(video_id)
             if not info:
@@ -464,28 +508,29 @@ async def handle_youtube_callback(
                 return
 
             # Proceed with download
-            await start_download(
-                client,
-                callback_query,
-                message,
-                video_id,
-                format_id,
-                info,
-                selected_format,
+            _spawn_download(
+                user_id,
+                start_download(
+                    client,
+                    callback_query,
+                    message,
+                    video_id,
+                    format_id,
+                    info,
+                    selected_format,
+                ),
             )
 
         elif callback_type == "ytdlconfirm":
-            # User confirmed a large download
-            original_callback_id = callback_id
-            cached_data = get_callback_data(original_callback_id)
-            if not cached_data:
+            # User confirmed a large download; the payload is the original
+            # "ytdl" one, carried over unchanged
+            if len(fields) != 2:
                 await callback_query.answer(
                     "This selection has expired. Please try again.", show_alert=True
                 )
                 return
 
-            video_id = cached_data.get("video_id")
-            format_id = cached_data.get("format_id")
+            video_id, format_id = fields
 
             info = get_video_info_from_cache(video_id)
             if not info:
@@ -508,14 +553,17 @@ async def handle_youtube_callback(
                 return
 
             # Proceed with download
-            await start_download(
-                client,
-                callback_query,
-                message,
-                video_id,
-                format_id,
-                info,
-                selected_format,
+            _spawn_download(
+                user_id,
+                start_download(
+                    client,
+                    callback_query,
+                    message,
+                    video_id,
+                    format_id,
+                    info,
+                    selected_format,
+                ),
             )
 
         elif callback_type == "ytqueueformat":
@@ -612,7 +660,7 @@ async def start_download(
     )
 
     # Set up progress tracking
-    start_time = time.time()
+    start_time = time.monotonic()
     last_update_time = start_time
     # Check if the selected format is NOT "flac" or "ytbestVideo"
     if isinstance(selected_format, dict):
@@ -624,10 +672,11 @@ async def start_download(
 
     async def progress_hook(d):
         nonlocal last_update_time
-        current_time = time.time()
+        current_time = time.monotonic()
 
-        # Check if download was cancelled
-        if active_downloads.get(user_id, {}).get("cancelled", False):
+        # Check if download was cancelled (cancelling drops the entry too)
+        state = active_downloads.get(user_id)
+        if state is None or state["cancelled"]:
             return
 
         if d["status"] == "downloading":
@@ -635,15 +684,12 @@ async def start_download(
             total_bytes = d.get("total_bytes", d.get("total_bytes_estimate", file_size))
 
             # Check for stalled download (no progress for a while)
-            if active_downloads[user_id]["last_progress"] == downloaded_bytes:
-                if active_downloads[user_id]["stalled_since"] is None:
-                    active_downloads[user_id]["stalled_since"] = current_time
-                elif (
-                    current_time - active_downloads[user_id]["stalled_since"]
-                    > STALLED_DOWNLOAD_TIMEOUT
-                ):
+            if state["last_progress"] == downloaded_bytes:
+                if state["stalled_since"] is None:
+                    state["stalled_since"] = current_time
+                elif current_time - state["stalled_since"] > STALLED_DOWNLOAD_TIMEOUT:
                     # Mark as cancelled due to stall
-                    active_downloads[user_id]["cancelled"] = True
+                    state["cancelled"] = True
                     try:
                         await message.edit_text(
                             "✖  Download stalled for too long. Cancelled automatically."
@@ -652,8 +698,8 @@ async def start_download(
                         pass
                     return
             else:
-                active_downloads[user_id]["last_progress"] = downloaded_bytes
-                active_downloads[user_id]["stalled_since"] = None
+                state["last_progress"] = downloaded_bytes
+                state["stalled_since"] = None
 
             # Update progress message at specified intervals
             if current_time - last_update_time >= PROGRESS_UPDATE_INTERVAL:
@@ -691,9 +737,30 @@ async def start_download(
                 except Exception as e:
                     logger.error(f"Error updating progress: {e}")
 
+    # Answer before waiting for a slot, or the query can expire in the queue
     try:
-        await callback_query.answer("Starting download...")
+        await callback_query.answer(
+            "⧗ Queued, waiting for a free slot..."
+            if _download_slots.locked()
+            else "Starting download..."
+        )
+    except Exception as e:
+        logger.debug(f"Could not answer download callback: {e}")
 
+    # Wait for a free slot; the message above already shows the request
+    _waiting_for_slot.add(user_id)
+    try:
+        await _download_slots.acquire()
+    finally:
+        _waiting_for_slot.discard(user_id)
+
+    # Cancelled while queued, after the slot had already been handed over
+    state = active_downloads.get(user_id)
+    if state is None or state["cancelled"]:
+        _download_slots.release()
+        return
+
+    try:
         # Download the video with retries
         for attempt in range(MAX_RETRIES):
             try:
@@ -738,7 +805,7 @@ async def start_download(
         # Check if download was cancelled during the process
         if active_downloads.get(user_id, {}).get("cancelled", False):
             if "result" in locals() and "file_path" in result and result["file_path"]:
-                clean_temporary_file(result["file_path"])
+                await asyncio.to_thread(clean_temporary_file, result["file_path"])
             await process_next_in_queue(client, user_id, message)
             return
 
@@ -780,7 +847,7 @@ async def start_download(
                     performer=performer,
                     duration=duration,
                     thumb=thumb_path if is_thumbnail_ok else None,
-                    caption=f"≡ __{title}__\n\n__Via__ @{(await client.get_me()).username}",
+                    caption=f"≡ __{title}__\n\n__Via__ @{await get_bot_username(client)}",
                     file_name=f"{title}.{ext}",
                     reply_to_message_id=(
                         callback_query.message.reply_to_message.id
@@ -794,7 +861,7 @@ async def start_download(
                     chat_id=message.chat.id,
                     thumb=thumb_path if is_thumbnail_ok else None,
                     video=file_path,
-                    caption=f"≡ __{title}__\n\n__via__ @{(await client.get_me()).username}",
+                    caption=f"≡ __{title}__\n\n__via__ @{await get_bot_username(client)}",
                     file_name=f"{title}.{ext}",
                     reply_to_message_id=(
                         callback_query.message.reply_to_message.id
@@ -813,8 +880,8 @@ async def start_download(
         finally:
             # Clean up downloaded file and active download status
             try:
-                if os.path.exists(file_path):
-                    clean_temporary_file(file_path)  # Delete the Media
+                # Delete the Media; a missing file is handled by the helper
+                await asyncio.to_thread(clean_temporary_file, file_path)
                 if os.path.exists(thumb_path):
                     delete_thumbnail(thumb_path)
             except Exception as e:
@@ -827,6 +894,8 @@ async def start_download(
         logger.error(f"Error handling YouTube download: {e}\n{error_trace}")
         await message.edit_text(f"✖  An error occurred during download: {str(e)}")
         await process_next_in_queue(client, user_id, message)
+    finally:
+        _download_slots.release()
 
 
 async def process_next_in_queue(client, user_id, message):
@@ -874,14 +943,17 @@ async def process_next_in_queue(client, user_id, message):
             )
 
             await message.edit_text("⟳ Starting next download from queue...")
-            await start_download(
-                client,
-                fake_callback,
-                message,
-                video_id,
-                format_id,
-                info,
-                selected_format,
+            _spawn_download(
+                user_id,
+                start_download(
+                    client,
+                    fake_callback,
+                    message,
+                    video_id,
+                    format_id,
+                    info,
+                    selected_format,
+                ),
             )
         else:
             # Just a video ID, need to show format selection
@@ -1,17 +1,39 @@
 # File: src/helpers/dlp/yt_dl/catch.py
 import logging
+import os
+import sqlite3
 import threading
 import time
-import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional, Tuple, Union
 
-from .dataclass import DownloadInfo, SearchInfo
+from src.config import YT_INFO_DB_PATH
+from src.helpers.json_utils import json_dumps, json_loads
+
+from .dataclass import DownloadInfo, FormatsView, SearchInfo
 
 # Configuration constants
-CACHE_EXPIRY_HOURS = 1  # Cache expiry time in hours
 VIDEO_CACHE_EXPIRY_HOURS = 2  # Video info cache expiry time in hours
-CLEANUP_INTERVAL_SECONDS = 300  # Clean up every 5 minutes
+VIDEO_CACHE_MAXSIZE = 256  # Max video info entries kept
+
+# Format fields the bot actually reads; everything else yt-dlp returns
+# (urls, fragments, headers...) is dropped before persisting
+_STORED_FORMAT_FIELDS = (
+    "format_id",
+    "format_note",
+    "ext",
+    "acodec",
+    "vcodec",
+    "height",
+    "width",
+    "fps",
+    "asr",
+    "tbr",
+    "filesize",
+    "filesize_approx",
+)
+_STORED_FORMAT_LISTS = ("formats", "video_formats", "audio_formats", "combined_formats")
 
 # Logging configuration
 logger = logging.getLogger(__name__)
@@ -19,22 +41,52 @@ logger = logging.getLogger(__name__)
 
 # Thread-safe cache structures
 class ThreadSafeCache:
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    """
+    Thread-safe LRU cache with per-entry TTL.
+
+    Entries past their TTL are dropped when read, and the least recently
+    used entry is evicted once ``maxsize`` is exceeded, so the cache never
+    needs a periodic sweep to stay bounded.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
         self._lock = threading.RLock()
+        self.maxsize = maxsize
+        self.ttl = ttl
 
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         with self._lock:
-            return self._cache.get(key)
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return value
 
-    def set(self, key: str, value: Dict[str, Any]) -> None:
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
         with self._lock:
-            self._cache[key] = value
+            self._cache[key] = (expires_at, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
 
     def delete(self, key: str) -> None:
         with self._lock:
-            if key in self._cache:
+            self._cache.pop(key, None)
+
+    def prune(self) -> int:
+        """Drop every expired entry and return how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (exp, _) in self._cache.items() if now >= exp]
+            for key in expired:
                 del self._cache[key]
+            return len(expired)
 
     def clear(self) -> int:
         with self._lock:
@@ -44,7 +96,7 @@ class ThreadSafeCache:
 
     def items(self) -> Tuple:
         with self._lock:
-            return tuple(self._cache.items())
+            return tuple((key, value) for key, (_, value) in self._cache.items())
 
     def keys(self) -> Tuple:
         with self._lock:
@@ -56,81 +108,105 @@ class ThreadSafeCache:
 
 
 # Initialize thread-safe cache structures
-callback_cache = ThreadSafeCache()
-video_info_cache = ThreadSafeCache()
-last_cleanup_time = time.time()
-cleanup_lock = threading.Lock()
-
-
-def generate_callback_id() -> str:
-    """
-    Generate a short unique ID for callbacks
-
-    Returns:
-        A unique ID as string
-    """
-    # Using uuid4 for better uniqueness while keeping it relatively short
-    # Added entropy by including timestamp to reduce collision probability
-    timestamp = int(time.time() * 1000) % 10000
-    random_id = uuid.uuid4().int % 1000000
-    combined = (timestamp * 1000000 + random_id) % 1000000
-    return str(combined).zfill(6)
-
+video_info_cache = ThreadSafeCache(
+    maxsize=VIDEO_CACHE_MAXSIZE, ttl=VIDEO_CACHE_EXPIRY_HOURS * 3600
+)
+formats_view_cache = ThreadSafeCache(
+    maxsize=VIDEO_CACHE_MAXSIZE, ttl=VIDEO_CACHE_EXPIRY_HOURS * 3600
+)
 
-def store_callback_data(
-    data: Dict[str, Any], expiry_hours: float = CACHE_EXPIRY_HOURS
-) -> str:
-    """
-    Store data in cache with expiry time and return a callback ID
-
-    Args:
-        data: Data to store in cache
-        expiry_hours: Hours until data expires
 
-    Returns:
-        Callback ID for retrieving the data
+class VideoInfoStore:
     """
-    _check_and_perform_cleanup()
-
-    # Ensure we get a unique ID that's not already in the cache
-    while True:
-        callback_id = generate_callback_id()
-        if callback_cache.get(callback_id) is None:
-            break
-
-    callback_cache.set(
-        callback_id,
-        {"data": data, "expires_at": datetime.now() + timedelta(hours=expiry_hours)},
-    )
-
-    logger.debug(f"Stored callback data with ID: {callback_id}")
-    return callback_id
+    SQLite-backed store for extracted video info.
 
-
-def get_callback_data(callback_id: str) -> Optional[Dict[str, Any]]:
+    Keeps metadata across restarts so a cold bot doesn't have to re-run the
+    yt-dlp extraction for videos it has already seen. Methods are blocking;
+    call them through ``asyncio.to_thread`` from async code.
     """
-    Retrieve data from cache if it exists and hasn't expired
 
-    Args:
-        callback_id: ID of the cached data
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS yt_info ("
+                "video_id TEXT PRIMARY KEY, json BLOB NOT NULL, "
+                "expires_at INTEGER NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _slim(info: SearchInfo) -> Dict[str, Any]:
+        data = info.model_dump(exclude={"all_formats"})
+        for key in _STORED_FORMAT_LISTS:
+            data[key] = [
+                {f: fmt[f] for f in _STORED_FORMAT_FIELDS if f in fmt}
+                for fmt in data.get(key) or ()
+            ]
+        return data
+
+    def get(self, video_id: str) -> Optional[SearchInfo]:
+        """Return the stored info for video_id, or None if missing or expired"""
+        try:
+            with self._lock:
+                row = (
+                    self._connection()
+                    .execute(
+                        "SELECT json FROM yt_info WHERE video_id = ? AND expires_at > ?",
+                        (video_id, int(time.time())),
+                    )
+                    .fetchone()
+                )
+            if row is None:
+                return None
+            data = json_loads(row[0])
+            data["all_formats"] = data["formats"]
+            return SearchInfo(**data)
+        except Exception as e:
+            logger.error(f"Error reading stored video info for {video_id}: {e}")
+            return None
 
-    Returns:
-        Cached data or None if not found or expired
-    """
-    cache_item = callback_cache.get(callback_id)
+    def put(self, info: SearchInfo) -> None:
+        """Persist info under its video ID for ``ttl`` seconds"""
+        try:
+            payload = json_dumps(self._slim(info))
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO yt_info (video_id, json, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (info.id, payload, int(time.time() + self.ttl)),
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error storing video info for {info.id}: {e}")
 
-    if cache_item is None:
-        logger.debug(f"Callback ID not found: {callback_id}")
-        return None
+    def prune(self) -> int:
+        """Delete expired rows and return how many were removed"""
+        with self._lock:
+            conn = self._connection()
+            cur = conn.execute(
+                "DELETE FROM yt_info WHERE expires_at <= ?", (int(time.time()),)
+            )
+            conn.commit()
+            return cur.rowcount
 
-    if datetime.now() > cache_item["expires_at"]:
-        # Clean up expired item
-        callback_cache.delete(callback_id)
-        logger.debug(f"Callback data expired: {callback_id}")
-        return None
 
-    logger.debug(f"Retrieved callback data: {callback_id}")
-    return cache_item["data"]
+video_info_store = VideoInfoStore(
+    YT_INFO_DB_PATH, ttl=VIDEO_CACHE_EXPIRY_HOURS * 3600
+)
 
 
 def add_video_info_to_cache(
@@ -185,6 +261,8 @@ def add_video_info_to_cache(
                 cache_info[list_attr] = []  # Use empty list instead of None
 
     video_info_cache.set(video_id, cache_info)
+    # Any view built from older info is stale now
+    formats_view_cache.delete(video_id)
     logger.debug(
         f"Added video info to cache: {video_id}, type: {original_type or 'dict'}"
     )
@@ -273,74 +351,50 @@ def get_video_info_from_cache(
     return info_copy
 
 
-def clear_video_info_cache() -> int:
+def get_formats_view(video_id: str, info: SearchInfo) -> FormatsView:
     """
-    Clear only the video info cache, leaving the callback cache intact
+    Get the all/video/audio format subsets for a video, building them once
+
+    Args:
+        video_id: YouTube video ID
+        info: Video information the view is built from on a miss
 
     Returns:
-        Number of video info items cleared
+        FormatsView shared by every filter and page click on this video
     """
-    count = video_info_cache.clear()
-    logger.info(f"Cleared video info cache: {count} items removed")
-    return count
+    view = formats_view_cache.get(video_id)
+    if view is None:
+        combined = info.combined_formats or []
+        view = FormatsView(
+            all=tuple(info.all_formats or info.formats or ()),
+            video=tuple(combined + (info.video_formats or [])),
+            audio=tuple(info.audio_formats or ()),
+        )
+        formats_view_cache.set(video_id, view)
+    return view
 
 
-def clear_callback_cache() -> int:
+def clear_video_info_cache() -> int:
     """
-    Clear the callback cache
+    Clear the video info cache
 
     Returns:
-        Number of callback items cleared
+        Number of video info items cleared
     """
-    count = callback_cache.clear()
-    logger.info(f"Cleared callback cache: {count} items removed")
+    count = video_info_cache.clear()
+    formats_view_cache.clear()
+    logger.info(f"Cleared video info cache: {count} items removed")
     return count
 
 
-def _check_and_perform_cleanup() -> None:
-    """
-    Check if cleanup is needed and perform it if necessary
-    """
-    global last_cleanup_time
-
-    current_time = time.time()
-    if current_time - last_cleanup_time > CLEANUP_INTERVAL_SECONDS:
-        # Use non-blocking check to prevent bottlenecks
-        if cleanup_lock.acquire(blocking=False):
-            try:
-                # Double-check after acquiring lock
-                if time.time() - last_cleanup_time > CLEANUP_INTERVAL_SECONDS:
-                    removed = clean_expired_cache()
-                    last_cleanup_time = time.time()
-                    logger.info(f"Performed cache cleanup: {removed} items removed")
-            finally:
-                cleanup_lock.release()
-
-
 def clean_expired_cache() -> int:
     """
-    Remove expired items from all caches
+    Remove expired items from the video info cache and its on-disk store
 
     Returns:
         Number of expired items removed
     """
-    current_time = datetime.now()
-    removed_count = 0
-
-    # Clean callback cache
-    for key, item in callback_cache.items():
-        if current_time > item["expires_at"]:
-            callback_cache.delete(key)
-            removed_count += 1
-
-    # Clean video info cache
-    video_expiry_time = current_time - timedelta(hours=VIDEO_CACHE_EXPIRY_HOURS)
-    for key, info in video_info_cache.items():
-        if info.get("cached_at", datetime.min) < video_expiry_time:
-            video_info_cache.delete(key)
-            removed_count += 1
-
-    return removed_count
+    return video_info_cache.prune() + video_info_store.prune()
 
 
 # Exception-safe decorator for cache operations
@@ -361,10 +415,7 @@ def cache_operation_safe(default_return=None):
 
 
 # Apply the decorator to public functions
-store_callback_data = cache_operation_safe("")(store_callback_data)
-get_callback_data = cache_operation_safe(None)(get_callback_data)
 add_video_info_to_cache = cache_operation_safe(None)(add_video_info_to_cache)
 get_video_info_from_cache = cache_operation_safe(None)(get_video_info_from_cache)
 clear_video_info_cache = cache_operation_safe(0)(clear_video_info_cache)
-clear_callback_cache = cache_operation_safe(0)(clear_callback_cache)
 clean_expired_cache = cache_operation_safe(0)(clean_expired_cache)
@@ -5,7 +5,7 @@
 #
 #
 
-from typing import List, Literal, Optional
+from typing import List, Literal, NamedTuple, Optional, Tuple
 
 from pydantic import BaseModel
 
@@ -50,6 +50,16 @@ class SearchInfo(BaseModel):
     combined_formats: Optional[List] = None
 
 
+class FormatsView(NamedTuple):
+    """
+    Immutable per-video format subsets, one per filter button
+    """
+
+    all: Tuple[dict, ...]
+    video: Tuple[dict, ...]
+    audio: Tuple[dict, ...]
+
+
 class PlaylistSearchResult(BaseModel):
     id: str
     title: str = "Unknown Playlist"
@@ -75,6 +85,7 @@ class VideoSearchResult(BaseModel):
     type: Literal["video"] = "video"
     live_status: Optional[str] = None
     exceeds_max_length: Optional[bool] = None
+    search_info: Optional[SearchInfo] = None
 
 
 # class CallBackData(BaseModel):
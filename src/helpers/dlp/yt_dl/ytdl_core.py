@@ -5,6 +5,8 @@ import random
 import re
 import threading
 import uuid
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
 
 import aiohttp
@@ -14,13 +16,83 @@ from src.helpers.dlp._yt_dlp import (DownloadTracker, cookie_manager,
                                      download_pool)
 from src.logging import LOGGER
 
+from .catch import ThreadSafeCache, video_info_store
 from .dataclass import (DownloadInfo, PlaylistSearchResult, SearchInfo,
                         VideoSearchResult)
 
 logger = LOGGER(__name__)
 
 from src.config import (CATCH_PATH, DEFAULT_COOKIES_DIR,
-                        MAX_VIDEO_LENGTH_MINUTES)
+                        MAX_VIDEO_LENGTH_MINUTES, YTDL_FRAGMENT_CONCURRENCY)
+
+# Full yt-dlp info dicts from fetch_youtube_info, handed to the download
+# that usually follows within seconds so it can skip a second extraction.
+# Stored as (cookie_file, info): the signed stream URLs are bound to the
+# session that extracted them, so the download must reuse that cookie. The
+# TTL stays far below the URLs' expiry; a 403 still falls back to extraction.
+_raw_info_cache = ThreadSafeCache(maxsize=32, ttl=120)
+
+# Progress statuses that must always reach the tracker
+_TERMINAL_STATUSES = ("finished", "error")
+
+# YouTube IDs are 11 characters of [A-Za-z0-9_-]
+_YTID_RE = re.compile(r"\A[A-Za-z0-9_-]{11}\Z")
+
+# Retry-After hints that yt-dlp copies into HTTP error messages
+_RETRY_AFTER_RE = re.compile(r"retry[- ]after\W*(\d+)", re.IGNORECASE)
+# Upper bound on any single retry wait, including server-sent Retry-After
+_MAX_RETRY_DELAY = 30.0
+
+# Options shared by every YouTube extraction/download in this module
+_BASE_OPTS = MappingProxyType(
+    {
+        "quiet": True,
+        "no_warnings": True,
+        "cache-dir": "/tmp/",
+        "socket_timeout": 30,
+        # Common user agent to avoid 403 errors
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    }
+)
+
+# The adaptive formats in the player response already cover everything the
+# bot offers; fetching the DASH/HLS manifests only adds round-trips
+_NO_MANIFEST_OPTS = MappingProxyType(
+    {
+        "youtube_include_dash_manifest": False,
+        "youtube_include_hls_manifest": False,
+    }
+)
+
+# Fixed part of the generic-link download options; each attempt only adds
+# the output template, user agent, format, hook and timeout
+_LINK_BASE_OPTS = MappingProxyType(
+    {
+        "nocheckcertificate": True,
+        "geo_bypass": True,
+        "quiet": True,
+        "no_warnings": True,
+        "socket_timeout": 30,
+        "retries": 2,
+        "fragment_retries": 5,
+        "external_downloader_args": [
+            "--max-concurrent-downloads",
+            "3",
+            "--max-connection-per-server",
+            "5",
+        ],
+        "ignoreerrors": False,
+    }
+)
+
+# Enhanced user-agent rotation for better reliability
+_LINK_USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/95.0.4638.69 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.71 Safari/537.36 Edg/97.0.1072.62",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:95.0) Gecko/20100101 Firefox/95.0",
+)
 
 # Ensure download directory exists
 os.makedirs(CATCH_PATH, exist_ok=True)
@@ -29,6 +101,42 @@ os.makedirs(DEFAULT_COOKIES_DIR, exist_ok=True)
 
 # Utils
 
+def _retry_delay(retry_count: int, error: Optional[str] = None) -> float:
+    """
+    Delay before the next retry: exponential backoff with jitter, or the
+    server's Retry-After (capped) when the error carries one
+
+    Args:
+        retry_count: Number of attempts made so far (1-based)
+        error: Error message of the failed attempt, if any
+
+    Returns:
+        Seconds to wait
+    """
+    if error:
+        match = _RETRY_AFTER_RE.search(error)
+        if match:
+            return min(_MAX_RETRY_DELAY, float(match.group(1)))
+    return min(_MAX_RETRY_DELAY, 2**retry_count) * (0.5 + random.random())
+
+
+def _extract_info(ydl_opts: Dict[str, Any], url: str) -> Optional[Dict[str, Any]]:
+    """
+    Run a metadata-only extract_info with a fresh YoutubeDL. Instances are
+    not reused: each holds its own cookie jar and HTTP handlers, which must
+    not leak between extractions that use different cookie files or users.
+
+    Args:
+        ydl_opts: yt-dlp options
+        url: URL or search query to extract
+
+    Returns:
+        The info dict returned by yt-dlp
+    """
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        return ydl.extract_info(url, download=False)
+
+
 def beautify_views(views: Union[int, str, float, None]) -> str:
     if views is None:
         return "0"
@@ -81,13 +189,9 @@ async def search_youtube(
     # Get a cookie file if requested
     cookie_file = await cookie_manager.get_cookie_file() if use_cookie else None
 
-    # Common user agent to avoid 403 errors
-    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-
     ydl_opts = {
+        **_BASE_OPTS,
         "format": "best",
-        "quiet": True,
-        "no_warnings": True,
         "extract_flat": "in_playlist",  # Changed to get more info while keeping playlist structure
         "default_search": "ytsearch",
         "geo_bypass": True,
@@ -95,10 +199,8 @@ async def search_youtube(
         "socket_timeout": timeout,
         "ignoreerrors": True,
         "skip_download": True,
-        "cache-dir": "/tmp/",
         "writeinfojson": False,
         "playlist_items": f"1-{max_results}",
-        "user_agent": user_agent,
     }
 
     if language:
@@ -108,13 +210,33 @@ async def search_youtube(
     if cookie_file:
         ydl_opts["cookiefile"] = cookie_file
 
+    # A single hit is extracted in full right away so callers can reuse its
+    # formats instead of paying for a second fetch_youtube_info round-trip.
+    # Same options as fetch_youtube_info: no format selection, which would
+    # fail (and be swallowed as a None entry) without a progressive format.
+    full_extract = max_results == 1
+    flat_opts = ydl_opts
+    if full_extract:
+        ydl_opts = {
+            **flat_opts,
+            "extract_flat": False,
+            "playlist_items": "1",
+            **_NO_MANIFEST_OPTS,
+        }
+        del ydl_opts["format"]
+
     try:
 
         def search_fn():
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Prefix query with search prefix and limit
-                search_query = f"ytsearch{max_results}:{query}"
-                return ydl.extract_info(search_query, download=False)
+            # Prefix query with search prefix and limit
+            search_query = f"ytsearch{max_results}:{query}"
+            search_results = _extract_info(ydl_opts, search_query)
+            if full_extract and not any(
+                (search_results or {}).get("entries") or ()
+            ):
+                # The full extraction failed; the flat result still has the hit
+                search_results = _extract_info(flat_opts, search_query)
+            return search_results
 
         # Run search in thread pool with timeout protection
         try:
@@ -132,61 +254,62 @@ async def search_youtube(
 
         # Process and return search results
         results = []
-        for entry in search_results.get("entries", []):
+        append = results.append
+        max_length_sec = MAX_VIDEO_LENGTH_MINUTES * 60
+        for entry in search_results.get("entries") or ():
             if not entry:
                 continue
 
+            g = entry.get
+            entry_id = g("id")
+
             # Handle playlist entries
-            if entry.get("_type") == "playlist" and include_playlists:
-                result = {
-                    "id": entry.get("id"),
-                    "title": entry.get("title", "Unknown Playlist"),
-                    "url": entry.get(
-                        "url",
-                        f"https://www.youtube.com/playlist?list={entry.get('id')}",
-                    ),
-                    "thumbnail": entry.get("thumbnail", None),
-                    "type": "playlist",
-                    "entries_count": entry.get("entries_count", 0),
-                    "uploader": entry.get("uploader", "Unknown"),
-                }
-                results.append(PlaylistSearchResult(**result))
-            else:
-                # Extract relevant information for videos
-                result = {
-                    "id": entry.get("id"),
-                    "title": entry.get("title", "Unknown Title"),
-                    "url": entry.get(
-                        "url", f"https://www.youtube.com/watch?v={entry.get('id')}"
-                    ),
-                    "thumbnail": entry.get("thumbnail", None),
-                    "duration": entry.get("duration", 0),
-                    "duration_string": format_duration(entry.get("duration", 0)),
-                    "uploader": entry.get("uploader", "Unknown"),
-                    "uploader_id": (
-                        "Unknown"
-                        if entry.get("uploader_id") is None
-                        else entry.get("uploader_id")
-                    ),
-                    "description": (
-                        ""
-                        if entry.get("description") is None
-                        else entry.get("description")
-                    ),
-                    "view_count": entry.get("view_count", 0),
-                    "upload_date": format_upload_date(entry.get("upload_date", "")),
-                    "type": "video",
-                    "live_status": entry.get("live_status", None),
-                }
+            if g("_type") == "playlist" and include_playlists:
+                append(
+                    PlaylistSearchResult(
+                        id=entry_id,
+                        title=g("title", "Unknown Playlist"),
+                        url=g(
+                            "url", f"https://www.youtube.com/playlist?list={entry_id}"
+                        ),
+                        thumbnail=g("thumbnail"),
+                        type="playlist",
+                        entries_count=g("entries_count", 0),
+                        uploader=g("uploader", "Unknown"),
+                    )
+                )
+                continue
 
-                # Check for videos that exceed maximum length
-                if (
-                    MAX_VIDEO_LENGTH_MINUTES > 0
-                    and entry.get("duration", 0) > MAX_VIDEO_LENGTH_MINUTES * 60
-                ):
-                    result["exceeds_max_length"] = True
+            # Extract relevant information for videos
+            duration = g("duration", 0)
+            uploader_id = g("uploader_id")
+            description = g("description")
+            result = {
+                "id": entry_id,
+                "title": g("title", "Unknown Title"),
+                # Full extractions put the stream URL in "url"
+                "url": g("webpage_url")
+                or g("url", f"https://www.youtube.com/watch?v={entry_id}"),
+                "thumbnail": g("thumbnail"),
+                "duration": duration,
+                "duration_string": format_duration(duration),
+                "uploader": g("uploader", "Unknown"),
+                "uploader_id": "Unknown" if uploader_id is None else uploader_id,
+                "description": "" if description is None else description,
+                "view_count": g("view_count", 0),
+                "upload_date": format_upload_date(g("upload_date", "")),
+                "type": "video",
+                "live_status": g("live_status"),
+            }
+
+            # Check for videos that exceed maximum length
+            if max_length_sec > 0 and (duration or 0) > max_length_sec:
+                result["exceeds_max_length"] = True
 
-                results.append(VideoSearchResult(**result))
+            if full_extract and g("formats"):
+                result["search_info"] = _build_search_info(entry, entry_id)
+
+            append(VideoSearchResult(**result))
 
         return results
     except Exception as e:
@@ -210,46 +333,104 @@ def format_duration(seconds: int) -> str:
 
 def format_upload_date(date_str: str) -> str:
     """Format upload date from YYYYMMDD to a readable format"""
-    if not date_str or len(date_str) != 8:
-        return date_str
+    if date_str and len(date_str) == 8 and date_str.isdigit():
+        return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
+    return date_str
+
+
+def _split_formats(info: Dict[str, Any]):
+    """
+    Split the formats of an extracted video into combined, video-only and
+    audio-only lists
+
+    Args:
+        info: Info dict returned by yt-dlp for a single video
+
+    Returns:
+        Tuple of (formats, combined_formats, video_formats, audio_formats)
+    """
+    combined, video_only, audio_only = [], [], []
+
+    # Single pass: partition by codec and compute each sort key once
+    for f in info.get("formats") or ():
+        acodec = f.get("acodec")
+        vcodec = f.get("vcodec")
+        if vcodec != "none":
+            height = f.get("height") or 0
+            if acodec != "none":
+                combined.append((height, f))
+            else:
+                video_only.append((height, f))
+        elif acodec != "none":
+            audio_only.append((f.get("asr") or 0, f))
+
+    # Sort by quality (height / sample rate) in descending order
+    first = itemgetter(0)
+    combined.sort(key=first, reverse=True)
+    video_only.sort(key=first, reverse=True)
+    audio_only.sort(key=first, reverse=True)
+
+    combined_formats = [f for _, f in combined]
+    video_formats = [f for _, f in video_only]
+    audio_formats = [f for _, f in audio_only]
+    formats = combined_formats + video_formats + audio_formats
+
+    return formats, combined_formats, video_formats, audio_formats
 
-    try:
-        year = date_str[:4]
-        month = date_str[4:6]
-        day = date_str[6:8]
-        return f"{year}-{month}-{day}"
-    except:
-        return date_str
 
+def _build_search_info(info: Dict[str, Any], video_id: str) -> SearchInfo:
+    """Build a SearchInfo from a full (non-flat) yt-dlp extraction"""
+    formats, combined_formats, video_formats, audio_formats = _split_formats(info)
 
-async def fetch_youtube_info(video_id: str) -> Optional[SearchInfo]:
+    return SearchInfo(
+        id=video_id,
+        title=info.get("title", "Unknown Title"),
+        duration=info.get("duration", 0),
+        thumbnail=info.get("thumbnail", None),
+        uploader=info.get("uploader", "Unknown"),
+        view_count=info.get("view_count", 0),
+        cache_dir="/tmp/",
+        upload_date=format_upload_date(info.get("upload_date", "")),
+        description=info.get("description", ""),
+        formats=formats,
+        all_formats=formats,
+        video_formats=video_formats,
+        audio_formats=audio_formats,
+        combined_formats=combined_formats,
+    )
+
+
+async def fetch_youtube_info(
+    video_id: str, max_duration: Optional[int] = None
+) -> Optional[SearchInfo]:
     """
     Fetch information about a YouTube video
 
     Args:
         video_id: The YouTube video ID
+        max_duration: If set, videos longer than this many seconds come back
+            with their metadata only (no formats), since they'll be rejected
 
     Returns:
         Dictionary containing video information or None if an error occurred
     """
+    # Info persisted by an earlier run skips the extraction entirely
+    stored = await asyncio.to_thread(video_info_store.get, video_id)
+    if stored is not None:
+        return stored
+
     # Get a cookie file
     cookie_file = await cookie_manager.get_cookie_file()
 
-    # Common user agent to avoid 403 errors
-    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-
     ydl_opts = {
-        "quiet": True,
+        **_BASE_OPTS,
         "simulate": True,
         "skip_download": True,
         "nocheckcertificate": True,
-        "no_warnings": True,
         "noplaylist": True,
-        "socket_timeout": 30,
-        "cache-dir": "/tmp/",
         "extract_flat": False,  # Changed to get full info
         "ignoreerrors": True,
-        "user_agent": user_agent,
+        **_NO_MANIFEST_OPTS,
     }
 
     # Add cookie file if available
@@ -264,10 +445,9 @@ async def fetch_youtube_info(video_id: str) -> Optional[SearchInfo]:
         try:
 
             def extract_info():
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    return ydl.extract_info(
-                        f"https://www.youtube.com/watch?v={video_id}", download=False
-                    )
+                return _extract_info(
+                    ydl_opts, f"https://www.youtube.com/watch?v={video_id}"
+                )
 
             # Run extraction in thread pool
             info = await download_pool.run_download(extract_info)
@@ -281,7 +461,7 @@ async def fetch_youtube_info(video_id: str) -> Optional[SearchInfo]:
                     # Get a different cookie file for the next attempt
                     cookie_file = await cookie_manager.get_cookie_file()
                     ydl_opts["cookiefile"] = cookie_file
-                    await asyncio.sleep(1)  # Short delay before retry
+                    await asyncio.sleep(_retry_delay(retry_count))
                     continue
                 return None
 
@@ -297,67 +477,34 @@ async def fetch_youtube_info(video_id: str) -> Optional[SearchInfo]:
                 # Get a different cookie file for the next attempt
                 cookie_file = await cookie_manager.get_cookie_file()
                 ydl_opts["cookiefile"] = cookie_file
-                await asyncio.sleep(1)  # Short delay before retry
+                await asyncio.sleep(_retry_delay(retry_count, str(e)))
                 continue
             logger.error(f"All attempts to fetch info for {video_id} failed: {str(e)}")
             return None
 
-    # Filter and sort formats
-    formats = []
-
-    # Add combined formats first (with both video and audio)
-    combined_formats = [
-        f
-        for f in info["formats"]
-        if f.get("acodec") != "none" and f.get("vcodec") != "none"
-    ]
-    # Sort by quality (height) in descending order
-    combined_formats.sort(key=lambda x: (x.get("height", 0) or 0), reverse=True)
-    # Add video_id to each format for reference
-    for fmt in combined_formats:
-        fmt["video_id"] = video_id
-    formats.extend(combined_formats)
-
-    # Add video-only formats
-    video_formats = [
-        f
-        for f in info["formats"]
-        if f.get("acodec") == "none" and f.get("vcodec") != "none"
-    ]
-    video_formats.sort(key=lambda x: (x.get("height", 0) or 0), reverse=True)
-    # Add video_id to each format for reference
-    for fmt in video_formats:
-        fmt["video_id"] = video_id
-    formats.extend(video_formats)
-
-    # Add audio-only formats
-    audio_formats = [
-        f
-        for f in info["formats"]
-        if f.get("acodec") != "none" and f.get("vcodec") == "none"
-    ]
-    audio_formats.sort(key=lambda x: (x.get("asr", 0) or 0), reverse=True)
-    # Add video_id to each format for reference
-    for fmt in audio_formats:
-        fmt["video_id"] = video_id
-    formats.extend(audio_formats)
+    duration = info.get("duration") or 0
+    if max_duration is not None and duration > max_duration:
+        # The caller will refuse this video, so skip splitting formats and
+        # don't keep anything around for a download that won't happen
+        return SearchInfo(
+            id=video_id,
+            title=info.get("title", "Unknown Title"),
+            duration=duration,
+            thumbnail=info.get("thumbnail", None),
+            uploader=info.get("uploader", "Unknown"),
+            view_count=info.get("view_count", 0),
+            upload_date=format_upload_date(info.get("upload_date", "")),
+            formats=[],
+            all_formats=[],
+            video_formats=[],
+            audio_formats=[],
+            combined_formats=[],
+        )
 
-    return SearchInfo(
-        id=video_id,
-        title=info.get("title", "Unknown Title"),
-        duration=info.get("duration", 0),
-        thumbnail=info.get("thumbnail", None),
-        uploader=info.get("uploader", "Unknown"),
-        view_count=info.get("view_count", 0),
-        cache_dir="/tmp/",
-        upload_date=format_upload_date(info.get("upload_date", "")),
-        description=info.get("description", ""),
-        formats=formats,
-        all_formats=formats,
-        video_formats=video_formats,
-        audio_formats=audio_formats,
-        combined_formats=combined_formats,
-    )
+    search_info = _build_search_info(info, video_id)
+    _raw_info_cache.set(video_id, (ydl_opts.get("cookiefile"), info))
+    await asyncio.to_thread(video_info_store.put, search_info)
+    return search_info
 
 
 async def download_youtube_video(
@@ -378,8 +525,16 @@ async def download_youtube_video(
     Returns:
         Dictionary with download results
     """
-    # Get a cookie file
-    cookie_file = await cookie_manager.get_cookie_file()
+    # Reuse the info resolved when the formats were listed, if still fresh,
+    # along with the cookie it was extracted with. It is taken out of the
+    # cache because processing mutates it.
+    cached = _raw_info_cache.get(video_id)
+    if cached is not None:
+        _raw_info_cache.delete(video_id)
+        cookie_file, raw_info = cached
+    else:
+        cookie_file = await cookie_manager.get_cookie_file()
+        raw_info = None
 
     # Create a download tracker for progress updates
     tracker = DownloadTracker(progress_callback)
@@ -387,26 +542,20 @@ async def download_youtube_video(
     # Create output filename with temp suffix during download
     output_template = f"{CATCH_PATH}/%(id)s.%(ext)s"
 
-    # Common user agent to avoid 403 errors
-    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-
-    common_opts = {
+    # Start with the common options
+    ydl_opts = {
+        **_BASE_OPTS,
         "nocheckcertificate": True,
         "addmetadata": True,
         "geo_bypass": True,
-        "quiet": True,
-        "cache-dir": "/tmp/",
-        "no_warnings": True,
         "outtmpl": output_template,
-        "socket_timeout": 30,
         "retries": 2,
         "fragment_retries": 5,
-        "user_agent": user_agent,
+        "concurrent_fragment_downloads": YTDL_FRAGMENT_CONCURRENCY,
+        "http_chunk_size": 10 * 1024 * 1024,
+        **_NO_MANIFEST_OPTS,
     }
 
-    # Start with the common options
-    ydl_opts = common_opts.copy()
-
     if bestflac:
         # Specific options for bestflac
         ydl_opts["format"] = "bestaudio"
@@ -431,45 +580,71 @@ async def download_youtube_video(
         ydl_opts["cookiefile"] = cookie_file
         logger.info(f"Using Cookie: {cookie_file}")
 
-    # Use a queue for thread-safe progress updates
-    progress_queue = asyncio.Queue()
-    stop_event = threading.Event()
-
-    # Task that processes progress updates from the queue
-    async def process_progress_updates():
-        while not stop_event.is_set() or not progress_queue.empty():
-            try:
-                progress_data = await asyncio.wait_for(
-                    progress_queue.get(), timeout=0.5
-                )
-                await tracker.update(progress_data)
-                progress_queue.task_done()
-            except asyncio.TimeoutError:
-                # No updates in queue, just continue
-                pass
-            except Exception as e:
-                logger.error(f"Error processing progress update: {str(e)}")
-
     # Get the current loop for thread-safe operations
     main_loop = asyncio.get_running_loop()
 
-    # Progress hook that puts updates in the queue rather than creating tasks directly
+    # Progress events not yet published, filled from the download thread.
+    # Plain ticks replace each other, but a terminal event is kept so the
+    # publisher always delivers it. Only the first event of a batch wakes the
+    # loop, so a fast download costs one wakeup per batch rather than per tick.
+    pending_updates: List[Dict[str, Any]] = []
+    pending_lock = threading.Lock()
+    wakeup_scheduled = False
+    progress_ready = asyncio.Event()
+    download_done = False
+
+    def offer_progress(update_data):
+        """Queue update_data for the publisher (safe from any thread)"""
+        nonlocal wakeup_scheduled
+        with pending_lock:
+            if (
+                pending_updates
+                and pending_updates[-1].get("status") not in _TERMINAL_STATUSES
+            ):
+                pending_updates[-1] = update_data
+            else:
+                pending_updates.append(update_data)
+            schedule = not wakeup_scheduled
+            wakeup_scheduled = True
+        if schedule:
+            main_loop.call_soon_threadsafe(progress_ready.set)
+
+    # Single task per download that forwards progress to the tracker
+    async def publish_progress():
+        nonlocal wakeup_scheduled
+        while True:
+            await progress_ready.wait()
+            progress_ready.clear()
+            with pending_lock:
+                batch = pending_updates[:]
+                pending_updates.clear()
+                wakeup_scheduled = False
+            for progress_data in batch:
+                try:
+                    await tracker.update(progress_data)
+                except Exception as e:
+                    logger.error(f"Error processing progress update: {str(e)}")
+            if download_done and not pending_updates:
+                return
+
+    async def finish_progress():
+        nonlocal download_done
+        download_done = True
+        progress_ready.set()
+        await progress_task
+
+    # Progress hook that hands updates to the loop rather than creating tasks directly
     def progress_hook(d):
         try:
-            # Create a copy to avoid reference issues and ensure status is present
-            update_data = d.copy()
-            if "status" not in update_data:
-                update_data["status"] = "unknown"
-
-            # Put in the queue using run_coroutine_threadsafe
-            asyncio.run_coroutine_threadsafe(progress_queue.put(update_data), main_loop)
+            # yt-dlp always sets status, so only copy in the rare case it's missing
+            offer_progress(d if "status" in d else {**d, "status": "unknown"})
         except Exception as e:
             logger.error(f"Error in progress hook: {str(e)}")
 
     ydl_opts["progress_hooks"] = [progress_hook]
 
-    # Start the progress processing task
-    progress_task = asyncio.create_task(process_progress_updates())
+    # Start the progress publisher
+    progress_task = asyncio.create_task(publish_progress())
 
     # Implement retries
     max_retries = 3
@@ -477,10 +652,26 @@ async def download_youtube_video(
 
     while retry_count < max_retries:
         try:
+            cached_info, raw_info = raw_info, None
 
             def download_fn():
                 try:
                     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                        if cached_info is not None:
+                            # Same path as --load-info-json: select and
+                            # download without re-running the extractor
+                            try:
+                                return ydl.process_ie_result(
+                                    cached_info, download=True
+                                )
+                            except yt_dlp.utils.DownloadError as e:
+                                if "403" not in str(e):
+                                    raise
+                                # The signed URLs were rejected; extract anew
+                                logger.warning(
+                                    f"Cached info for {video_id} got HTTP 403, "
+                                    "re-extracting"
+                                )
                         return ydl.extract_info(
                             f"https://www.youtube.com/watch?v={video_id}", download=True
                         )
@@ -510,17 +701,16 @@ async def download_youtube_video(
                         "max_retries": max_retries,
                         "error": error_msg,
                     }
-                    await progress_queue.put(retry_update)
+                    offer_progress(retry_update)
 
                     # Get a different cookie file for next attempt
                     cookie_file = await cookie_manager.get_cookie_file()
                     ydl_opts["cookiefile"] = cookie_file
-                    await asyncio.sleep(2)  # Delay before retry
+                    await asyncio.sleep(_retry_delay(retry_count, error_msg))
                     continue
 
                 # All retries failed
-                stop_event.set()
-                await progress_task
+                await finish_progress()
 
                 return {"success": False, "error": error_msg}
 
@@ -541,51 +731,50 @@ async def download_youtube_video(
                     "max_retries": max_retries,
                     "error": str(e),
                 }
-                await progress_queue.put(retry_update)
+                offer_progress(retry_update)
 
                 # Get a different cookie file for next attempt
                 cookie_file = await cookie_manager.get_cookie_file()
                 ydl_opts["cookiefile"] = cookie_file
-                await asyncio.sleep(2)  # Delay before retry
+                await asyncio.sleep(_retry_delay(retry_count, str(e)))
                 continue
 
             # All retries failed
-            stop_event.set()
             try:
-                await progress_task
+                await finish_progress()
             except:
                 pass
 
             return {"success": False, "error": str(e)}
 
-    # Stop the progress processing
-    stop_event.set()
-    await progress_task
+    # Stop the progress publisher
+    await finish_progress()
 
     file_path = get_final_file_path(info, video_id, bestflac, bestVideo)
 
     ext = file_path.split(".")[-1] if "." in file_path else ""
 
-    if os.path.exists(file_path):
-        return DownloadInfo(
-            success=True,
-            id=info.get("id"),
-            url=info.get("webpage_url"),
-            file_path=file_path,
-            title=info.get("title", "Unknown Title"),
-            performer=info.get("uploader", "Unknown Channel"),
-            thumbnail=info.get("thumbnail", ""),
-            ext=ext,
-            filesize=os.path.getsize(file_path),
-            duration=info.get("duration", 0),
-        )
-
-    else:
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
         return DownloadInfo(
             success=False,
             error="Download completed but file not found at expected location",
         )
 
+    return DownloadInfo(
+        success=True,
+        id=info.get("id"),
+        url=info.get("webpage_url"),
+        file_path=file_path,
+        title=info.get("title", "Unknown Title"),
+        performer=info.get("uploader", "Unknown Channel"),
+        thumbnail=info.get("thumbnail", ""),
+        ext=ext,
+        filesize=file_stat.st_size,
+        duration=info.get("duration", 0),
+    )
+
 
 def get_final_file_path(
     info, video_id: str, bestflac: bool = False, bestVideo: bool = False
@@ -599,42 +788,39 @@ def get_final_file_path(
         bestflac: Whether FLAC conversion was requested
 
     Returns:
-        Detected file path
+        Detected file path (always a string)
     """
 
+    prefix = os.path.join(CATCH_PATH, video_id) + "."
+
     # Check postprocessed files
     if bestflac:
-        possible_paths = [
-            os.path.join(CATCH_PATH, f"{video_id}.flac"),
-            os.path.join(CATCH_PATH, f"{video_id}.m4a"),  # Alternate audio formats
-            os.path.join(CATCH_PATH, f"{video_id}.webm"),
-        ]
-
-        for path in possible_paths:
-            if os.path.exists(path):
-                logger.info(f"Found file for FLAC conversion: {path}")
-                return path
+        possible_paths = (
+            prefix + "flac",
+            prefix + "m4a",  # Alternate audio formats
+            prefix + "webm",
+        )
     elif bestVideo:
-        possible_paths = [
-            os.path.join(CATCH_PATH, f"{video_id}.mp4"),
-            os.path.join(CATCH_PATH, f"{video_id}.webm"),  # Alternate Video formats
-        ]
+        possible_paths = (
+            prefix + "mp4",
+            prefix + "webm",  # Alternate Video formats
+        )
+    else:
+        possible_paths = ()
 
-        for path in possible_paths:
-            if os.path.exists(path):
-                logger.info(f"Found file for FLAC conversion: {path}")
-                return path
+    for path in possible_paths:
+        if os.path.exists(path):
+            logger.info(f"Found postprocessed file: {path}")
+            return path
 
     # Check requested downloads first
     if "requested_downloads" in info and info["requested_downloads"]:
         file_path = info["requested_downloads"][0]["filepath"]
         if os.path.exists(file_path):
             return file_path
-    # Fallback filename construction
-    ext = "flac" if bestflac else "mp4"
-    fallback_path = os.path.join(CATCH_PATH, f"{video_id}.{ext}")
 
-    return fallback_path, ext
+    # Fallback filename construction
+    return prefix + ("flac" if bestflac else "mp4")
 
 
 def is_valid_youtube_id(video_id: str) -> bool:
@@ -647,32 +833,7 @@ def is_valid_youtube_id(video_id: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    # Basic validation: YouTube IDs are 11 characters long and contain alphanumeric chars, underscore and dash
-    return len(video_id) == 11 and all(c.isalnum() or c in "-_" for c in video_id)
-
-
-def get_formats_by_type(info: Dict[str, Any], filter_type: str) -> List[Dict[str, Any]]:
-    """
-    Get formats filtered by type
-
-    Args:
-        info: Video info dictionary
-        filter_type: Type of formats to return ('all', 'video', 'audio')
-
-    Returns:
-        List of formats
-    """
-    if not info:
-        return []
-
-    if filter_type == "all":
-        return info.get("all_formats", [])
-    elif filter_type == "video":
-        return info.get("combined_formats", []) + info.get("video_formats", [])
-    elif filter_type == "audio":
-        return info.get("audio_formats", [])
-    else:
-        return info.get("all_formats", [])
+    return video_id is not None and _YTID_RE.match(video_id) is not None
 
 
 def is_audio_format(format_info: Dict[str, Any]) -> bool:
@@ -699,12 +860,12 @@ def clean_temporary_file(file_path: str) -> bool:
         True if successfully deleted, False otherwise
     """
     try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            logger.info(f"Deleted temporary file: {file_path}")
-            return True
+        os.unlink(file_path)
+        logger.info(f"Deleted temporary file: {file_path}")
+        return True
+    except FileNotFoundError:
         return False
-    except Exception as e:
+    except OSError as e:
         logger.error(f"Error cleaning up file {file_path}: {str(e)}")
         return False
 
@@ -822,15 +983,7 @@ async def download_video_from_link(
     unique_id = str(uuid.uuid4())[:8]
     output_template = f"{output_dir}/%(title)s-{unique_id}-%(id)s.%(ext)s"
 
-    # Enhanced user-agent rotation for better reliability
-    user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/95.0.4638.69 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Safari/605.1.15",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.71 Safari/537.36 Edg/97.0.1072.62",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:95.0) Gecko/20100101 Firefox/95.0",
-    ]
-    user_agent = random.choice(user_agents)
+    user_agent = random.choice(_LINK_USER_AGENTS)
 
     # Initialize file size checker
     file_size_checker = FileSizeRestriction(MAX_SIZE_BYTES)
@@ -851,6 +1004,15 @@ async def download_video_from_link(
                     progress_data = await asyncio.wait_for(
                         progress_queue.get(), timeout=PROGRESS_TIMEOUT
                     )
+                    # Ticks that piled up while the last callback ran are
+                    # stale; forward only the newest, but never skip past a
+                    # terminal event
+                    while (
+                        progress_data.get("status") not in _TERMINAL_STATUSES
+                        and not progress_queue.empty()
+                    ):
+                        progress_queue.task_done()
+                        progress_data = progress_queue.get_nowait()
                     await progress_callback(progress_data)
                     progress_queue.task_done()
                 except asyncio.TimeoutError:
@@ -949,7 +1111,8 @@ async def download_video_from_link(
                     if key in d["info_dict"]:
                         update_data["info_dict"][key] = d["info_dict"][key]
 
-            asyncio.run_coroutine_threadsafe(progress_queue.put(update_data), main_loop)
+            # Plain callback onto the loop: no coroutine or future per tick
+            main_loop.call_soon_threadsafe(progress_queue.put_nowait, update_data)
         except Exception as e:
             if str(e) == "Download cancelled by user":
                 # Propagate cancellation
@@ -977,6 +1140,7 @@ async def download_video_from_link(
 
     # Start progress processing task
     progress_task = asyncio.create_task(process_progress_updates())
+    progress_hooks = [progress_hook]
 
     # Set up download with retry logic
     retry_count = 0
@@ -1010,26 +1174,13 @@ async def download_video_from_link(
 
         # Set up download options
         ydl_opts = {
-            "nocheckcertificate": True,
-            "geo_bypass": True,
-            "quiet": True,
-            "no_warnings": True,
+            **_LINK_BASE_OPTS,
             "outtmpl": output_template,
-            "socket_timeout": 30,
-            "retries": 2,
-            "fragment_retries": 5,
             "user_agent": user_agent,
             "format": formats[
                 min(retry_count, len(formats) - 1)
             ],  # Use format based on retry count
-            "progress_hooks": [progress_hook],
-            "external_downloader_args": [
-                "--max-concurrent-downloads",
-                "3",
-                "--max-connection-per-server",
-                "5",
-            ],
-            "ignoreerrors": False,
+            "progress_hooks": progress_hooks,
             "timeout": timeout,
         }
 
@@ -11,9 +11,10 @@ The filters help manage bot resources and prevent abuse while ensuring
 smooth operation within Telegram's rate limitations.
 """
 
+import asyncio
 import re
 import time
-from typing import Callable, Dict, List, Union
+from typing import Callable, Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 import yt_dlp
@@ -21,8 +22,8 @@ from pyrogram import filters
 from pyrogram.enums import ChatType
 from pyrogram.types import CallbackQuery, Message
 
-from src.config import OWNER_USERID, SUDO_USERID
-from src.helpers.dlp._rex import LINK_REGEX_PATTERNS
+from src.config import OWNER_USERID_SET, SUDO_USERID_SET
+from src.helpers.dlp._rex import COMBINED_LINK_REGEX
 from src.helpers.ratelimiter import RateLimiter
 from src.logging import LOGGER
 
@@ -71,12 +72,12 @@ async def _is_banned(user_id: int) -> bool:
 
 def is_developer(_, __, message: Message) -> bool:
     """Filter messages from developer/owner users only."""
-    return message.from_user and message.from_user.id in OWNER_USERID
+    return message.from_user and message.from_user.id in OWNER_USERID_SET
 
 
 def is_sudo_user(_, __, message: Message) -> bool:
     """Filter messages from sudo users only."""
-    return message.from_user and message.from_user.id in SUDO_USERID
+    return message.from_user and message.from_user.id in SUDO_USERID_SET
 
 
 # ============================================================================
@@ -88,10 +89,13 @@ CHAT_RATE_LIMITER = RateLimiter(
     limit_sec=1, limit_min=20, interval_sec=1, interval_min=60
 )
 
-# Global rate limiter (30 msg/sec globally as per Telegram limits)
-GLOBAL_RATE_LIMITER = RateLimiter(
-    limit_sec=30, limit_min=1800, interval_sec=1, interval_min=60
-)
+# Global rate limit (30 msg/sec globally as per Telegram limits), enforced
+# with an in-process token bucket since every update hits this key
+GLOBAL_RATE = 30.0
+GLOBAL_BURST = 30.0
+# Global bucket state: tokens left and the time of the last refill
+_global_tokens = GLOBAL_BURST
+_global_last = time.monotonic()
 
 # Download operation rate limiter
 DOWNLOAD_RATE_LIMITER = RateLimiter(
@@ -104,200 +108,147 @@ DOWNLOAD_CALLBACK_RATE_LIMITER = RateLimiter(
 )
 
 
-# ============================================================================
-# General Rate Limiting Filter
-# ============================================================================
-
-
-async def check_rate_limit(_, __, update: Union[Message, CallbackQuery]) -> bool:
+def _take_global_token() -> bool:
     """
-    Filter to prevent rate limit violations for general bot operations.
-
-    Implements Telegram's official rate limits:
-    - 20 messages per minute in the same group
-    - 30 messages per second globally across all chats
-
-    Private chats are not rate-limited by this filter.
-
-    Args:
-        update: The Message or CallbackQuery to check
+    Synchronous token-bucket check against the global update limit.
 
     Returns:
-        bool: True if not rate-limited, False otherwise
+        bool: True if a token was taken, False if the bot is rate-limited
     """
-
-    # extract user
-    user = getattr(update, "from_user", None)
-    if not user:
-        return False
-    if not user:
+    global _global_tokens, _global_last
+    now = time.monotonic()
+    tokens = min(GLOBAL_BURST, _global_tokens + (now - _global_last) * GLOBAL_RATE)
+    _global_last = now
+    if tokens < 1:
+        _global_tokens = tokens
         return False
+    _global_tokens = tokens - 1
+    return True
 
-    # 🚫 BAN CHECK (FIRST)
-    if await _is_banned(user.id):
-        logger.info(f"Ignored banned user: {user.id}")
-        return False
-
-
-    # Check global rate limit first
-    is_global_limited = await GLOBAL_RATE_LIMITER.acquire("global_update")
-    if is_global_limited:
-        chat_id = (
-            update.chat.id if isinstance(update, Message) else update.message.chat.id
-        )
-        logger.info(f"Global rate limit hit while processing chat: {chat_id}")
-        return False
-
-    # Extract chat info
-    chat_id = update.chat.id if isinstance(update, Message) else update.message.chat.id
-    chat_type = (
-        update.chat.type if isinstance(update, Message) else update.message.chat.type
-    )
-
-    # Skip rate limiting for private chats
-    if chat_type != ChatType.PRIVATE:
-        is_chat_limited = await CHAT_RATE_LIMITER.acquire(chat_id)
-        if is_chat_limited:
-            if isinstance(update, CallbackQuery):
-                await update.answer(
-                    "Bot is receiving too many requests, please try again later.",
-                    show_alert=True,
-                )
-            logger.info(f"Chat rate limit hit for: {chat_id}")
-            return False
 
-    return True
+# Per update type: (chat getter, coroutine factory to notify the user).
+# Callbacks on inline-mode messages carry no message, hence no chat.
+_UPDATE_DISPATCH = {
+    Message: (
+        lambda u: u.chat,
+        lambda u, text: u.reply_text(text, quote=True),
+    ),
+    CallbackQuery: (
+        lambda u: u.message.chat if u.message is not None else None,
+        lambda u, text: u.answer(text, show_alert=True),
+    ),
+}
 
 
 # ============================================================================
-# Download Operation Rate Limiting Filter
+# Rate Limiting Filter Factory
 # ============================================================================
 
 
-async def check_download_rate_limit(
-    _, __, update: Union[Message, CallbackQuery]
-) -> bool:
+def make_rate_limit_filter(
+    extra_limiter: Optional[RateLimiter] = None,
+    extra_limit_text: str = "",
+    skip_private: bool = True,
+    label: str = "update",
+) -> Callable:
     """
-    Filter to prevent rate limit violations specifically for download operations.
+    Build a rate-limit filter function for ``filters.create``.
 
-    Implements stricter limits for resource-intensive download operations:
-    - Still respects global limits
-    - Adds download-specific limits per chat
+    Every filter built here applies, in order:
+    - the ban check
+    - Telegram's 30 messages per second global limit
+    - an optional operation-specific limit per chat (``extra_limiter``)
+    - Telegram's 20 messages per minute per chat limit
 
     Args:
-        update: The Message or CallbackQuery to check
+        extra_limiter: Stricter per-chat limiter checked before the chat limit
+        extra_limit_text: Text sent to the user when ``extra_limiter`` is hit
+        skip_private: Whether private chats bypass rate limiting entirely
+        label: Operation name used in log messages
 
     Returns:
-        bool: True if not rate-limited, False otherwise
+        Callable: Async filter returning True if not rate-limited
     """
-    user = getattr(update, "from_user", None)
-    if not user:
-        return False
-    if not user:
-        return False
-
-    # 🚫 BAN CHECK
-    if await _is_banned(user.id):
-        logger.info(f"Ignored banned user: {user.id}")
-        return False
-    
-    # Check global rate limit first
-    is_global_limited = await GLOBAL_RATE_LIMITER.acquire("global_update")
-    if is_global_limited:
-        chat_id = (
-            update.chat.id if isinstance(update, Message) else update.message.chat.id
-        )
-        logger.info(
-            f"Global rate limit hit while processing download from chat: {chat_id}"
-        )
-        return False
-
-    # Extract chat info
-    chat_id = update.chat.id if isinstance(update, Message) else update.message.chat.id
-    chat_type = (
-        update.chat.type if isinstance(update, Message) else update.message.chat.type
-    )
+    async def check(_, __, update: Union[Message, CallbackQuery]) -> bool:
+        # extract user
+        user = getattr(update, "from_user", None)
+        if not user:
+            return False
 
-    # Check both regular chat limit and download-specific limit
-    is_download_limited = await DOWNLOAD_RATE_LIMITER.acquire(chat_id)
-    is_chat_limited = await CHAT_RATE_LIMITER.acquire(chat_id)
-    if is_download_limited:
-        if isinstance(update, CallbackQuery):
-            await update.answer(
-                "Download limit reached. Please try again in a few minutes.",
-                show_alert=True,
-            )
-        elif isinstance(update, Message):
-            await update.reply_text(
-                "Download limit reached. Please try again in a few minutes.", quote=True
-            )
-        logger.info(f"Download rate limit hit for chat: {chat_id}")
-        return False
+        # 🚫 BAN CHECK (FIRST)
+        if await _is_banned(user.id):
+            logger.info("Ignored banned user: %s", user.id)
+            return False
 
-    elif is_chat_limited:
-        if isinstance(update, CallbackQuery):
-            await update.answer(
-                "Bot is receiving too many requests, please try again later.",
-                show_alert=True,
+        # Extract chat info
+        handlers = _UPDATE_DISPATCH.get(type(update))
+        # Other update types, and updates without a chat, aren't limited here
+        if handlers is None:
+            return True
+        get_chat, notify = handlers
+        chat = get_chat(update)
+        if chat is None:
+            return True
+
+        # Skip rate limiting for private chats, before touching any bucket.
+        # Replies there still count toward Telegram's global cap when sent.
+        if skip_private and chat.type == ChatType.PRIVATE:
+            return True
+
+        chat_id = chat.id
+
+        # Check global rate limit first
+        if not _take_global_token():
+            logger.info(
+                "Global rate limit hit while processing %s from chat: %s",
+                label,
+                chat_id,
             )
-            logger.info(f"Chat rate limit hit for download from: {chat_id}")
-        return False
-
-    return True
-
+            return False
 
-# ============================================================================
-# Download Callback Rate Limiting Filter
-# ============================================================================
+        # Check the operation-specific limit and the regular chat limit
+        if extra_limiter is None:
+            extra_ok, chat_ok = True, CHAT_RATE_LIMITER.try_acquire(chat_id)
+        else:
+            extra_ok, chat_ok = extra_limiter.check_pair(chat_id, CHAT_RATE_LIMITER)
 
+        if not extra_ok:
+            await notify(update, extra_limit_text)
+            logger.info("%s rate limit hit for chat: %s", label, chat_id)
+            return False
 
-async def check_download_callback_rate_limit(_, __, update: CallbackQuery) -> bool:
-    """
-    Filter to prevent rate limit violations for download-related callbacks.
+        if not chat_ok:
+            if type(update) is CallbackQuery:
+                await notify(
+                    update,
+                    "Bot is receiving too many requests, please try again later.",
+                )
+            logger.info("Chat rate limit hit for %s from: %s", label, chat_id)
+            return False
 
-    Args:
-        update: The CallbackQuery to check
+        return True
 
-    Returns:
-        bool: True if not rate-limited, False otherwise
-    """
+    return check
 
-    if await _is_banned(update.from_user.id):
-        logger.info(f"Ignored banned user: {update.from_user.id}")
-        return False
-    
-    # Check global rate limit first
-    is_global_limited = await GLOBAL_RATE_LIMITER.acquire("global_update")
-    if is_global_limited:
-        logger.info(
-            f"Global rate limit hit while processing download callback from chat: {update.message.chat.id}"
-        )
-        return False
 
-    # Extract chat info
-    chat_id = update.message.chat.id
-    # Skip rate limiting for private chats
-    # Check both callback-specific and general chat limits
-    is_callback_limited = await DOWNLOAD_CALLBACK_RATE_LIMITER.acquire(chat_id)
-    is_chat_limited = await CHAT_RATE_LIMITER.acquire(chat_id)
-
-    if is_callback_limited:
-        await update.answer(
-            "Calm down! Action limit reached. Please try again.You might need to wait.",
-            show_alert=True,
-        )
-        logger.info(f"Download callback rate limit hit for chat: {chat_id}")
-        return False
+# General bot operations; private chats are not rate-limited
+check_rate_limit = make_rate_limit_filter()
 
-    elif is_chat_limited:
-        await update.answer(
-            "Bot is receiving too many requests, please try again later.",
-            show_alert=True,
-        )
-        logger.info(f"Chat rate limit hit for download callback from: {chat_id}")
-        return False
+# Stricter limits for resource-intensive download operations
+check_download_rate_limit = make_rate_limit_filter(
+    DOWNLOAD_RATE_LIMITER,
+    "Download limit reached. Please try again in a few minutes.",
+    skip_private=False,
+    label="download",
+)
 
-    return True
+# Download-related callbacks
+check_download_callback_rate_limit = make_rate_limit_filter(
+    DOWNLOAD_CALLBACK_RATE_LIMITER,
+    "Calm down! Action limit reached. Please try again.You might need to wait.",
+    skip_private=False,
+    label="download callback",
+)
 
 
 # ============================================================================
@@ -315,11 +266,7 @@ def is_blocked_url(_, __, message: Message) -> bool:
     Returns:
         bool: True if URL is allowed, False if it matches a blocked pattern
     """
-    text = message.text or ""
-    for pattern in LINK_REGEX_PATTERNS:
-        if re.search(pattern, text, re.IGNORECASE):
-            return False
-    return True
+    return COMBINED_LINK_REGEX.search(message.text or "") is None
 
 
 # ============================================================================
@@ -525,9 +472,11 @@ class YTDLPUrlFilter:
             if not urls:
                 return False
 
-            # Check if any URL is supported
+            # Check if any URL is supported. The check may run a yt-dlp
+            # extraction, so keep it off the event loop.
+            loop = asyncio.get_running_loop()
             for url in urls:
-                if cls.is_supported_url(url):
+                if await loop.run_in_executor(None, cls.is_supported_url, url):
                     # Store the found URL in message.ytdlp_url for easy access in handlers
                     message.ytdlp_url = url
                     return True
@@ -562,7 +511,6 @@ ytdlp_url = YTDLPUrlFilter.has_supported_url()
 
 
 # preload cache once at startup
-import asyncio
 asyncio.create_task(_refresh_ban_cache())
 
 # old
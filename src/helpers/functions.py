@@ -5,10 +5,15 @@
 #
 #
 
+from typing import Optional
+
+from pyrogram import Client
 from pyrogram.enums import ChatMemberStatus, ChatType
 from pyrogram.types import Message
 
-from src.config import SUDO_USERID
+from src.config import SUDO_USERID_SET
+
+_BOT_USERNAME: Optional[str] = None
 
 
 async def isAdmin(message: Message) -> bool:
@@ -20,7 +25,7 @@ async def isAdmin(message: Message) -> bool:
         return
 
     user_id = message.from_user.id
-    if user_id in SUDO_USERID:
+    if user_id in SUDO_USERID_SET:
         return True
 
     check_status = await message.chat.get_member(user_id)
@@ -30,6 +35,15 @@ async def isAdmin(message: Message) -> bool:
     ]
 
 
+async def get_bot_username(client: Client) -> str:
+    """Return the bot's username, fetching it from Telegram only once."""
+
+    global _BOT_USERNAME
+    if _BOT_USERNAME is None:
+        _BOT_USERNAME = (await client.get_me()).username
+    return _BOT_USERNAME
+
+
 def get_readable_time(seconds: int) -> str:
     """Return a human-readable time format from seconds."""
 
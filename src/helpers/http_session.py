@@ -0,0 +1,64 @@
+# File: src/helpers/http_session.py
+#  Copyright (c) 2025 Rkgroup.
+#  Quick Dl is an open-source Downloader bot licensed under MIT.
+#  All rights reserved where applicable.
+#
+#
+
+import asyncio
+import atexit
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from src.logging import LOGGER
+
+logger = LOGGER(__name__)
+
+# One pooled session per caller name, so repeated requests reuse keep-alive
+# connections and cached DNS instead of a fresh handshake every time
+_SESSIONS: Dict[str, Tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]] = {}
+
+
+def get_shared_session(
+    name: str,
+    *,
+    timeout: Optional[aiohttp.ClientTimeout] = None,
+    **connector_kwargs: Any,
+) -> aiohttp.ClientSession:
+    """
+    Return the shared session for `name`, creating it for the running loop if
+    needed
+
+    Args:
+        name: Key identifying the caller's session
+        timeout: Default timeout for requests made through the session
+        **connector_kwargs: Passed to aiohttp.TCPConnector on creation
+
+    Returns:
+        The pooled aiohttp.ClientSession
+    """
+    loop = asyncio.get_running_loop()
+    entry = _SESSIONS.get(name)
+    # A session is tied to the loop it was created on; config.py fetches
+    # cookies on the import-time loop before the bot's own loop takes over.
+    if entry is None or entry[0].closed or entry[1] is not loop:
+        session_kwargs: Dict[str, Any] = {
+            "connector": aiohttp.TCPConnector(**connector_kwargs)
+        }
+        if timeout is not None:
+            session_kwargs["timeout"] = timeout
+        entry = (aiohttp.ClientSession(**session_kwargs), loop)
+        _SESSIONS[name] = entry
+    return entry[0]
+
+
+@atexit.register
+def _close_sessions() -> None:
+    for name, (session, loop) in _SESSIONS.items():
+        if session.closed or loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(session.close())
+        except Exception as e:
+            logger.warning(f"Error closing {name} session: {e}")
@@ -0,0 +1,46 @@
+# File: src/helpers/json_utils.py
+#  Copyright (c) 2025 Rkgroup.
+#  Quick Dl is an open-source Downloader bot licensed under MIT.
+#  All rights reserved where applicable.
+#
+#
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def json_loads(payload: Union[bytes, str]) -> Any:
+    """
+    Parse JSON with orjson when it is installed, else the stdlib
+
+    Args:
+        payload: JSON text or bytes
+
+    Returns:
+        The decoded object
+    """
+    # orjson raises a JSONDecodeError subclass, so one except clause covers both
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def json_dumps(data: Any) -> bytes:
+    """
+    Serialize to compact JSON bytes with orjson when it is installed, else the
+    stdlib
+
+    Args:
+        data: Object to encode
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
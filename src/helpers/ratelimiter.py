@@ -5,7 +5,8 @@
 #
 #
 
-from typing import Union
+from collections import OrderedDict
+from typing import Tuple, Union
 
 from pyrate_limiter import (BucketFullException, Duration, Limiter,
                             MemoryListBucket, RequestRate)
@@ -24,6 +25,7 @@ class RateLimiter:
         limit_min: int,
         interval_sec: int = Duration.SECOND,
         interval_min: int = Duration.MINUTE,
+        max_keys: int = 100_000,
     ) -> None:
         """Request rate definition.
 
@@ -32,6 +34,8 @@ class RateLimiter:
             limit_min: Number of requests allowed within ``interval``
             interval_sec: Time interval, in seconds
             interval_min: Time interval, in sec but for larger time
+            max_keys: Number of per-key buckets kept before the least
+                recently used one is dropped
 
         """
 
@@ -45,6 +49,65 @@ class RateLimiter:
             self.second_rate, self.minute_rate, bucket_class=MemoryListBucket
         )
 
+        # Keys in least -> most recently used order, to cap bucket memory
+        self.max_keys = max_keys
+        self._keys = OrderedDict()
+
+    def _touch(self, update_id: Union[int, str]) -> None:
+        """Mark update_id as recently used, evicting the LRU bucket if full."""
+
+        keys = self._keys
+        if update_id in keys:
+            keys.move_to_end(update_id)
+            return
+
+        keys[update_id] = None
+        if len(keys) > self.max_keys:
+            stale_id, _ = keys.popitem(last=False)
+            bucket_group = getattr(self.limiter, "bucket_group", None)
+            if bucket_group is not None:
+                bucket_group.pop(stale_id, None)
+
+    def try_acquire(self, update_id: Union[int, str]) -> bool:
+        """
+        Non-blocking acquire for use inside filters: never sleeps or
+        awaits, so concurrent updates are never serialized behind it.
+
+        params:
+            update_id (int | str): unique identifier for update.
+
+        returns:
+            bool: True if a slot was taken, False if update_id is ratelimited.
+        """
+
+        self._touch(update_id)
+        try:
+            self.limiter.try_acquire(update_id)
+            return True
+        except BucketFullException:
+            return False
+
+    def check_pair(
+        self, update_id: Union[int, str], other: "RateLimiter"
+    ) -> Tuple[bool, bool]:
+        """
+        Acquire from this limiter and then ``other`` for the same update_id,
+        in one call. ``other`` is only charged when this limiter passes, so
+        a rejected update never burns credit in the second bucket.
+
+        params:
+            update_id (int | str): unique identifier for update.
+            other (RateLimiter): limiter checked after this one.
+
+        returns:
+            Tuple[bool, bool]: (ok_self, ok_other); ok_other is True when
+            ``other`` was not consulted.
+        """
+
+        if not self.try_acquire(update_id):
+            return False, True
+        return True, other.try_acquire(update_id)
+
     async def acquire(self, update_id: Union[int, str]) -> bool:
         """
         Acquire rate limit per update_id and return True / False
@@ -57,8 +120,4 @@ class RateLimiter:
             bool: True if update_id is ratelimited else False.
         """
 
-        try:
-            self.limiter.try_acquire(update_id)
-            return False
-        except BucketFullException:
-            return True
+        return not self.try_acquire(update_id)
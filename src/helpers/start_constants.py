@@ -2,9 +2,10 @@
 from src.version import (__license__, __pyro_version__, __python_version__,
                          __version__)
 
-QUICKDL_BANNER = "https://raw.githubusercontent.com/RKgroupkg/Telegram-AllDlp-Bot/refs/heads/main/src/helpers/assets/QuickDlBanner.jpg"
-QUICKDL_LOGO   = "https://raw.githubusercontent.com/RKgroupkg/Telegram-AllDlp-Bot/refs/heads/main/src/helpers/assets/QuickDlLogo.jpg"
-RKGROUP_LOGO   = "https://raw.githubusercontent.com/RKgroupkg/Telegram-AllDlp-Bot/refs/heads/main/src/helpers/assets/RKgroupLogo.jpg"
+ASSETS_URL     = "https://raw.githubusercontent.com/RKgroupkg/Telegram-AllDlp-Bot/refs/heads/main/src/helpers/assets/"
+QUICKDL_BANNER = ASSETS_URL + "QuickDlBanner.jpg"
+QUICKDL_LOGO   = ASSETS_URL + "QuickDlLogo.jpg"
+RKGROUP_LOGO   = ASSETS_URL + "RKgroupLogo.jpg"
 
 BOT_NAME = "@Quick_dlbot"
 
@@ -245,7 +245,7 @@ async def cb_diag(_, query: CallbackQuery):
             title = info.get("title", "Unknown Title")
             uploader = info.get("uploader", "Unknown")
             duration = info.get("duration", "?")
-            report.append(f"[3] YouTube extraction ........... OK")
+            report.append("[3] YouTube extraction ........... OK")
             report.append(f"    Title: {escape_markdown(title)}")
             report.append(f"    Uploader: {escape_markdown(uploader)}")
             report.append(f"    Duration: {duration}s")
@@ -6,7 +6,6 @@
 from __future__ import annotations
 from typing import List, Optional
 import re
-import asyncio
 
 from pyrogram import filters
 from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
@@ -82,8 +81,7 @@ async def cookie_handler(_, message: Message):
     for url in urls:
         url_to_process = extract_url(url) or url
         try:
-            await asyncio.sleep(1)  # simulate processing delay
-            result = await save_all_cookies(url_to_process)
+            result = await save_all_cookies([url_to_process])
             success_count += 1
             processed_results.extend(result)
         except Exception as e:
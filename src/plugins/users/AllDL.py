@@ -2,7 +2,6 @@
 import asyncio
 import html
 import os
-import re
 import time
 from enum import Enum, auto
 from functools import wraps
@@ -13,7 +12,7 @@ from pyrogram.enums import ParseMode
 from pyrogram.types import (CallbackQuery, InlineKeyboardButton,
                             InlineKeyboardMarkup, Message)
 
-from src.helpers.dlp._rex import URL_REGEX
+from src.helpers.dlp._rex import URL_RE
 from src.helpers.dlp._Thumb.thumbnail import (delete_thumbnail,
                                               download_and_verify_thumbnail)
 from src.helpers.dlp._util import format_size, format_time
@@ -23,6 +22,7 @@ from src.helpers.dlp.yt_dl.ytdl_core import (DownloadInfo,
 from src.helpers.filters import (allowed_url,
                                  is_download_callback_rate_limited,
                                  is_download_rate_limited, ytdlp_url)
+from src.helpers.functions import get_bot_username
 from src.logging import LOGGER
 
 logger = LOGGER(__name__)
@@ -301,7 +301,9 @@ def download_handler(func):
                 and os.path.exists(download_info.file_path)
             ):
                 try:
-                    await clean_temporary_file(download_info.file_path)
+                    await asyncio.to_thread(
+                        clean_temporary_file, download_info.file_path
+                    )
                     logger.info(f"Cleaned up file: {download_info.file_path}")
                 except Exception as e:
                     logger.error(
@@ -420,12 +422,6 @@ async def handle_queue_info(client: Client, callback_query: CallbackQuery):
 
 
 # Main download handler
-@Client.on_message(
-    ytdlp_url & allowed_url & filters.incoming & filters.text & is_download_rate_limited
-)
-
-
-# Main download handler for direct messages
 @Client.on_message(ytdlp_url & allowed_url & filters.text & is_download_rate_limited)
 async def text_msg_handler(client: Client, message: Message):
     """Handle video/media download requests from URLs"""
@@ -454,7 +450,7 @@ async def video_handler(client: Client, message: Message):
     thumb_path = None
 
     # Extract URL first
-    match = re.search(URL_REGEX, message.text or "")
+    match = URL_RE.search(message.text or "")
     if not match:
         await message.reply_text("⚠ No valid link found in your message.")
         return
@@ -529,7 +525,7 @@ async def video_handler(client: Client, message: Message):
 
         async def progress_callback(progress_data):
             nonlocal last_update_time, last_progress_text
-            now = time.time()
+            now = time.monotonic()
 
             # Update progress tracking
             download_manager.register_progress(chat_id, msg.id, progress_data)
@@ -694,7 +690,7 @@ async def video_handler(client: Client, message: Message):
         if performer:
             caption += f"♚ **Creator **: __{html.escape(performer)}__\n"
 
-        caption += f"\n__via__ @{(await client.get_me()).username}"
+        caption += f"\n__via__ @{await get_bot_username(client)}"
 
         # Upload based on file type
         upload_start_time = time.time()
@@ -789,7 +785,7 @@ async def video_handler(client: Client, message: Message):
             and os.path.exists(download_info.file_path)
         ):
             try:
-                clean_temporary_file(download_info.file_path)
+                await asyncio.to_thread(clean_temporary_file, download_info.file_path)
                 logger.info(f"Cleaned up file: {download_info.file_path}")
             except Exception as e:
                 logger.error(f"Error cleaning up file {download_info.file_path}: {e}")
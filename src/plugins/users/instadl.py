@@ -6,8 +6,7 @@
 #
 
 import asyncio
-import re
-import uuid
+import itertools
 from typing import Any, Dict, List, Optional
 
 from pyrogram import Client, enums, filters
@@ -19,16 +18,28 @@ from pyrogram.types import (ChatPrivileges, InlineKeyboardButton,
 
 from src.config import RAPID_API_KEYS
 from src.helpers.decorators import catch_errors
-from src.helpers.dlp._rex import INSTAGRAM_URL_PATTERN
+from src.helpers.dlp._rex import INSTAGRAM_URL_RE
 from src.helpers.dlp.Insta_dl.insta_dl import get_instagram_post_data
 from src.helpers.filters import is_download_rate_limited, is_rate_limited
+from src.helpers.functions import get_bot_username
 from src.helpers.start_constants import BOT_NAME  # bot name
 from src.logging import LOGGER
 
+# Footer appended to private-chat captions, built once at import
+_CAPTION_FOOTER = f"\n\nBy: {BOT_NAME}"
+
 # Cache for storing recently processed Instagram media (to avoid repeated API calls)
 MEDIA_CACHE = {}
 CACHE_TTL = 3600  # Cache time-to-live in seconds (1 hour)
 
+# Inline result IDs only have to be unique within one answer, so a counter
+# is enough and avoids pulling CSPRNG bytes for every result
+_RESULT_IDS = itertools.count()
+
+
+def _next_result_id() -> str:
+    return format(next(_RESULT_IDS) & 0xFFFFFFFF, "x")
+
 
 class InstagramDownloader:
     """
@@ -53,7 +64,7 @@ class InstagramDownloader:
 
         try:
             LOGGER(__name__).info(f"Extracting media from: {instagram_url}")
-            result = get_instagram_post_data(instagram_url, RAPID_API_KEYS)
+            result = await get_instagram_post_data(instagram_url, RAPID_API_KEYS)
             if result:
                 # Cache the result
                 MEDIA_CACHE[instagram_url] = result
@@ -78,13 +89,32 @@ class InstagramDownloader:
             LOGGER(__name__).debug(f"Removed {url} from cache")
 
 
+# Strong references to fire-and-forget cleanup tasks until they finish
+_BACKGROUND_TASKS = set()
+
+
+async def _safe_delete(msg: Message) -> None:
+    """Delete a message, logging instead of raising on failure."""
+    try:
+        await msg.delete()
+    except Exception as e:
+        LOGGER(__name__).error(f"Failed to delete message: {e}")
+
+
+def _delete_in_background(msg: Message) -> None:
+    """Schedule a message deletion without holding up the handler."""
+    task = asyncio.create_task(_safe_delete(msg))
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+
+
 # Function to extract all Instagram URLs from a message
 def extract_instagram_urls(text: str) -> List[str]:
     """Extract all Instagram post URLs from the given text."""
     if not text:
         return []
 
-    matches = re.finditer(INSTAGRAM_URL_PATTERN, text)
+    matches = INSTAGRAM_URL_RE.finditer(text)
     return [match.group(0) for match in matches]
 
 
@@ -92,7 +122,7 @@ def extract_instagram_urls(text: str) -> List[str]:
 def instagram_link_filter(_, __, message: Message) -> bool:
     """Filter to check if a message contains Instagram links."""
     if message.text:
-        return bool(re.search(INSTAGRAM_URL_PATTERN, message.text))
+        return bool(INSTAGRAM_URL_RE.search(message.text))
     return False
 
 
@@ -171,7 +201,7 @@ async def instagram_downloader_handler(client: Client, message: Message) -> None
                 caption += f"Caption: <i>{media_data['caption'][:300]}</i>"
                 if len(media_data["caption"]) > 300:
                     caption += "..."
-            caption += f"\n\nBy: {BOT_NAME}"
+            caption += _CAPTION_FOOTER
         else:
             # Case 2 & 3: Group/Supergroup chat
             try:
@@ -281,7 +311,7 @@ async def instagram_downloader_handler(client: Client, message: Message) -> None
                                     )
 
         # Delete the processing message
-        await processing_msg.delete()
+        _delete_in_background(processing_msg)
         # Try deleting user msg if perm is there in group for it.
         try:
             if bot_member:  # if it's None then likely it isn't in a group
@@ -331,7 +361,7 @@ async def instagram_command_handler(client: Client, message: Message) -> None:
     instagram_url = message.command[1]
 
     # Validate URL
-    if not re.match(INSTAGRAM_URL_PATTERN, instagram_url):
+    if not INSTAGRAM_URL_RE.match(instagram_url):
         await message.reply_text("✖ Invalid Instagram URL format.", quote=True)
         return
 
@@ -418,7 +448,7 @@ async def instagram_command_handler(client: Client, message: Message) -> None:
                                     )
 
         # Delete the processing message
-        await processing_msg.delete()
+        _delete_in_background(processing_msg)
 
     except Exception as e:
         LOGGER(__name__).error(f"Error processing Instagram link: {e}")
@@ -477,7 +507,7 @@ def instagram_inline_filter(_, __, query: InlineQuery):
         return False
 
     # Check if the query matches the Instagram pattern
-    return bool(re.search(INSTAGRAM_URL_PATTERN, query.query.strip()))
+    return bool(INSTAGRAM_URL_RE.search(query.query.strip()))
 
 
 # Register the custom filter
@@ -501,8 +531,7 @@ async def instagram_inline_handler(client: Client, inline_query: InlineQuery) ->
 
     # Get bot username for later use
     try:
-        bot_info = await client.get_me()
-        bot_username = bot_info.username
+        bot_username = await get_bot_username(client)
     except Exception as e:
         LOGGER(__name__).error(f"Failed to get bot info: {e}")
         bot_username = "InstagramDLBot"  # Fallback value
@@ -518,7 +547,7 @@ async def instagram_inline_handler(client: Client, inline_query: InlineQuery) ->
     #                     f"To use Instagram Downloader, type @{bot_username} followed by an Instagram URL"
     #                 ),
     #                 thumb_url="https://static.poder360.com.br/2021/12/instagram-logo.jpg",
-    #                 id=str(uuid.uuid4())
+    #                 id=_next_result_id()
     #             )
     #         ],
     #         cache_time=1
@@ -547,7 +576,7 @@ async def instagram_inline_handler(client: Client, inline_query: InlineQuery) ->
                             "https://www.instagram.com/reel/XXXXX/"
                         ),
                         thumb_url="https://static.poder360.com.br/2021/12/instagram-logo.jpg",
-                        id=str(uuid.uuid4()),
+                        id=_next_result_id(),
                     )
                 ],
                 cache_time=1,
@@ -580,7 +609,7 @@ async def instagram_inline_handler(client: Client, inline_query: InlineQuery) ->
                         f"No media found at: {instagram_url}\n\nTry downloading directly in chat."
                     ),
                     thumb_url="https://static.poder360.com.br/2021/12/instagram-logo.jpg",
-                    id=str(uuid.uuid4()),
+                    id=_next_result_id(),
                 )
             )
         else:
@@ -597,7 +626,7 @@ async def instagram_inline_handler(client: Client, inline_query: InlineQuery) ->
             for i, media_item in enumerate(medias):
                 media_url = media_item.get("link")
                 media_type = media_item.get("type")
-                result_id = str(uuid.uuid4())
+                result_id = _next_result_id()
 
                 # Basic caption without original caption to avoid issues
                 caption = " "
@@ -661,7 +690,7 @@ async def instagram_inline_handler(client: Client, inline_query: InlineQuery) ->
                         description="Send link directly to chat to see all",
                         input_message_content=InputTextMessageContent(instagram_url),
                         thumb_url="https://static.poder360.com.br/2021/12/instagram-logo.jpg",
-                        id=str(uuid.uuid4()),
+                        id=_next_result_id(),
                     )
                 )
 
@@ -672,7 +701,7 @@ async def instagram_inline_handler(client: Client, inline_query: InlineQuery) ->
                 description=instagram_url,
                 input_message_content=InputTextMessageContent(instagram_url),
                 thumb_url="https://static.poder360.com.br/2021/12/instagram-logo.jpg",
-                id=str(uuid.uuid4()),
+                id=_next_result_id(),
             )
         )
 
@@ -685,7 +714,7 @@ async def instagram_inline_handler(client: Client, inline_query: InlineQuery) ->
                     f"/instagram {instagram_url}"
                 ),
                 thumb_url="https://static.poder360.com.br/2021/12/instagram-logo.jpg",
-                id=str(uuid.uuid4()),
+                id=_next_result_id(),
             )
         )
 
@@ -697,7 +726,7 @@ async def instagram_inline_handler(client: Client, inline_query: InlineQuery) ->
                     description="Try sending the link directly to chat",
                     input_message_content=InputTextMessageContent(instagram_url),
                     thumb_url="https://static.poder360.com.br/2021/12/instagram-logo.jpg",
-                    id=str(uuid.uuid4()),
+                    id=_next_result_id(),
                 )
             )
 
@@ -721,14 +750,14 @@ async def instagram_inline_handler(client: Client, inline_query: InlineQuery) ->
                         f"Could not process Instagram URL: {instagram_url}\n\nTry sending the link directly to chat."
                     ),
                     thumb_url="https://static.poder360.com.br/2021/12/instagram-logo.jpg",
-                    id=str(uuid.uuid4()),
+                    id=_next_result_id(),
                 ),
                 InlineQueryResultArticle(
                     title="Share Original Instagram Link",
                     description=instagram_url,
                     input_message_content=InputTextMessageContent(instagram_url),
                     thumb_url="https://static.poder360.com.br/2021/12/instagram-logo.jpg",
-                    id=str(uuid.uuid4()),
+                    id=_next_result_id(),
                 ),
             ],
             cache_time=5,  # Short cache time for errors
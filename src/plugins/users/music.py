@@ -10,7 +10,6 @@ from pyrogram.types import (CallbackQuery, InlineKeyboardButton,
 from src import bot
 from src.helpers.dlp._util import format_duration, truncate_text
 from src.helpers.dlp.yt_dl.catch import (add_video_info_to_cache,
-                                         clean_expired_cache,
                                          get_video_info_from_cache)
 from src.helpers.dlp.yt_dl.dataclass import (PlaylistSearchResult,
                                              VideoSearchResult)
@@ -177,9 +176,6 @@ async def music_select_handler(_, query: CallbackQuery):
     Handle music track selection
     """
     try:
-        # Run cache cleanup
-        clean_expired_cache()
-
         # Extract music track ID
         video_id = query.data.split(":")[1]
         user_id = query.from_user.id
@@ -212,6 +208,14 @@ async def music_select_handler(_, query: CallbackQuery):
         )
 
         if selected_track:
+            # The search result already knows the duration; reject long
+            # videos before paying for a full extraction
+            if selected_track.duration > MAX_VIDEO_LENGTH_MINUTES * 60:
+                await msg.edit_text(
+                    f"⚠ Video is too long ({selected_track.duration // 60} minutes). Maximum allowed duration is {MAX_VIDEO_LENGTH_MINUTES} minutes."
+                )
+                return
+
             # Fetch video information with retries
             cached_info = get_video_info_from_cache(video_id)
             if cached_info:
@@ -220,7 +224,9 @@ async def music_select_handler(_, query: CallbackQuery):
             else:
                 logger.info(f"Fetching info for video {video_id}")
                 try:
-                    info = await fetch_youtube_info(video_id)
+                    info = await fetch_youtube_info(
+                        video_id, max_duration=MAX_VIDEO_LENGTH_MINUTES * 60
+                    )
                     if info.success:
                         add_video_info_to_cache(video_id, info)
                     else:
@@ -252,7 +258,9 @@ async def music_select_handler(_, query: CallbackQuery):
                 )
                 return
             # Show available formats
-            format_markup = create_format_selection_markup(formats)
+            format_markup = create_format_selection_markup(
+                formats, video_id=video_id
+            )
             await msg.edit_text(
                 f"≡ __{info.title[:30]}...__\n\n"
                 f"𓇳 Uploader: __{info.uploader}__\n"
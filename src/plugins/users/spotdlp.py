@@ -19,10 +19,9 @@ from SpotiFLAC import SpotiFLAC
 from src import bot
 from src.config import CATCH_PATH
 from src.logging import LOGGER
-from src.helpers.dlp._rex import (SPOTIFY_ALBUM_REGEX, SPOTIFY_PLAYLIST_REGEX,
-                                   SPOTIFY_TRACK_REGEX)
-from src.helpers.dlp.yt_dl.catch import (add_video_info_to_cache,
-                                          clean_expired_cache)
+from src.helpers.dlp._rex import (SPOTIFY_ALBUM_RE, SPOTIFY_PLAYLIST_RE,
+                                   SPOTIFY_TRACK_RE)
+from src.helpers.dlp.yt_dl.catch import add_video_info_to_cache
 from src.helpers.dlp.yt_dl.dataclass import SearchInfo
 from src.helpers.dlp.yt_dl.utils import create_format_selection_markup
 from src.helpers.dlp.yt_dl.ytdl_core import fetch_youtube_info, search_youtube
@@ -109,8 +108,8 @@ class TrackSession:
 # UTILITIES
 # ══════════════════════════════════════════════════════════════════════════════
 
-def extract_spotify_id(text: str, pattern: str) -> Optional[str]:
-    match = re.search(pattern, text)
+def extract_spotify_id(text: str, pattern: re.Pattern) -> Optional[str]:
+    match = pattern.search(text)
     return match.group(1) if match else None
 
 
@@ -354,9 +353,8 @@ async def _youtube_format_selection(
         f"{Emoji.SEARCH} <b>{session.title}</b>\n<i>→ Searching YouTube…</i>"
     )
 
-    clean_expired_cache()
     query       = f"{session.title} {session.artist} official audio"
-    results     = await search_youtube(query, max_results=5)
+    results     = await search_youtube(query, max_results=1)
 
     if not results:
         await status_msg.edit_text(
@@ -364,7 +362,10 @@ async def _youtube_format_selection(
         )
         return False
 
-    youtube_info = await fetch_youtube_info(results[0].id)
+    # Single-hit searches already carry the full extraction
+    youtube_info = getattr(results[0], "search_info", None)
+    if youtube_info is None:
+        youtube_info = await fetch_youtube_info(results[0].id)
     if not youtube_info or not youtube_info.all_formats:
         await status_msg.edit_text(
             f"{Emoji.ERROR} <b>{session.title}</b>\n<i>No downloadable formats available.</i>"
@@ -372,12 +373,14 @@ async def _youtube_format_selection(
         return False
 
     add_video_info_to_cache(youtube_info.id, youtube_info)
-    markup = create_format_selection_markup(youtube_info.all_formats)
+    markup = create_format_selection_markup(
+        youtube_info.all_formats, video_id=youtube_info.id
+    )
 
     caption  = build_info_message(session).replace(
         f"{Emoji.QUALITY} <b>High-Quality Sources Available</b>\n", ""
     )
-    caption += f"\n▶️ <b>Source:</b> <i>YouTube</i>\n\n"
+    caption += "\n▶️ <b>Source:</b> <i>YouTube</i>\n\n"
     caption += f"<i>{Emoji.INFO} Select format to download:</i>"
 
     if session.album_art:
@@ -515,7 +518,7 @@ async def download_and_upload(
 # ══════════════════════════════════════════════════════════════════════════════
 
 @bot.on_message(
-    filters.regex(SPOTIFY_TRACK_REGEX)
+    filters.regex(SPOTIFY_TRACK_RE)
     | filters.command(["spt", "spotify", "sptdlp", "dlmusic"])
     & is_download_rate_limited
 )
@@ -527,7 +530,7 @@ async def spotify_track_handler(_, message: Message):
     to build the session and the URL to pass to SpotiFLAC later.
     The source-selection UI is shown immediately with no network round-trip.
     """
-    track_id = extract_spotify_id(message.text, SPOTIFY_TRACK_REGEX)
+    track_id = extract_spotify_id(message.text, SPOTIFY_TRACK_RE)
     if not track_id:
         logger.warning("Could not extract track ID from message")
         return
@@ -599,9 +602,9 @@ async def spotify_download_callback(_, callback_query: CallbackQuery):
 
 # ── Album / Playlist handlers (info-only — unchanged logic) ──────────────────
 
-@bot.on_message(filters.regex(SPOTIFY_ALBUM_REGEX) & is_download_rate_limited)
+@bot.on_message(filters.regex(SPOTIFY_ALBUM_RE) & is_download_rate_limited)
 async def spotify_album_handler(_, message: Message):
-    album_id = extract_spotify_id(message.text, SPOTIFY_ALBUM_REGEX)
+    album_id = extract_spotify_id(message.text, SPOTIFY_ALBUM_RE)
     if not album_id:
         return
 
@@ -614,9 +617,9 @@ async def spotify_album_handler(_, message: Message):
     )
 
 
-@bot.on_message(filters.regex(SPOTIFY_PLAYLIST_REGEX) & is_download_rate_limited)
+@bot.on_message(filters.regex(SPOTIFY_PLAYLIST_RE) & is_download_rate_limited)
 async def spotify_playlist_handler(_, message: Message):
-    playlist_id = extract_spotify_id(message.text, SPOTIFY_PLAYLIST_REGEX)
+    playlist_id = extract_spotify_id(message.text, SPOTIFY_PLAYLIST_RE)
     if not playlist_id:
         return
 
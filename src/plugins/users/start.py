@@ -9,7 +9,7 @@ from pyrogram.types import (CallbackQuery, InlineKeyboardButton,
                             InlineKeyboardMarkup, InputMediaPhoto, Message)
 
 from src import bot
-from src.config import OWNER_USERID, SUDO_USERID
+from src.config import OWNER_USERID_SET, SUDO_USERID_SET
 from src.database import database
 from src.helpers.filters import (is_download_callback_rate_limited,
                                  is_rate_limited)
@@ -92,7 +92,7 @@ async def botCallbacks(_, callback: CallbackQuery):
     data = callback.data
 
     if data == "SUDO_BUTTON":
-        if clicker_id not in SUDO_USERID:
+        if clicker_id not in SUDO_USERID_SET:
             return await callback.answer(
                 "You are not in the sudo user list.", show_alert=True
             )
@@ -101,7 +101,7 @@ async def botCallbacks(_, callback: CallbackQuery):
         )
 
     if data == "DEV_BUTTON":
-        if clicker_id not in OWNER_USERID:
+        if clicker_id not in OWNER_USERID_SET:
             return await callback.answer(
                 "This is a developer-restricted section.", show_alert=True
             )
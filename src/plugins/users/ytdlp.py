@@ -5,13 +5,14 @@
 #
 #
 
+import asyncio
 import os
 import time
 
 from pyrogram import Client, filters
 from pyrogram.types import CallbackQuery, Message
 
-from src.helpers.dlp._rex import YT_LINK_REGEX
+from src.helpers.dlp._rex import YT_LINK_RE
 from src.helpers.dlp.yt_dl.callback import (handle_youtube_callback,
                                             handle_youtube_link)
 from src.helpers.dlp.yt_dl.catch import clean_expired_cache
@@ -23,6 +24,40 @@ from src.logging import LOGGER
 logger = LOGGER(__name__)
 
 
+DOWNLOAD_PATH = "./tmp"
+TEMP_FILE_MAX_AGE = 12 * 3600  # seconds
+
+
+def _sync_clean_tmpdir(path: str, max_age: float = TEMP_FILE_MAX_AGE) -> int:
+    """Delete files in ``path`` older than ``max_age`` seconds (blocking)"""
+    deleted = 0
+    cutoff = time.time() - max_age
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    deleted += 1
+            except FileNotFoundError:
+                continue
+    return deleted
+
+
+def _sync_tmpdir_usage(path: str):
+    """Return (file_count, total_bytes) for the files in ``path`` (blocking)"""
+    count = 0
+    total = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    count += 1
+                    total += entry.stat().st_size
+            except FileNotFoundError:
+                continue
+    return count, total
+
+
 # Clean expired cache periodically
 @Client.on_message(filters.command("clean_ytcache") & sudo_cmd)
 async def clean_cache_command(client: Client, message: Message):
@@ -30,24 +65,16 @@ async def clean_cache_command(client: Client, message: Message):
     if not message.from_user or not message.from_user.id:
         return
 
-    # Clean expired callbacks
+    # Clean expired video info
     start_time = time.time()
     cleaned_count = clean_expired_cache()
 
     # Also clean temporary download directory
     temp_files_deleted = 0
     try:
-        download_path = "./tmp"
-        if os.path.exists(download_path):
-            for filename in os.listdir(download_path):
-                file_path = os.path.join(download_path, filename)
-                # Check if file is older than 12 hours
-                if (
-                    os.path.isfile(file_path)
-                    and time.time() - os.path.getmtime(file_path) > 12 * 3600
-                ):
-                    os.remove(file_path)
-                    temp_files_deleted += 1
+        temp_files_deleted = await asyncio.to_thread(_sync_clean_tmpdir, DOWNLOAD_PATH)
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logger.error(f"Error cleaning temporary files: {e}")
 
@@ -94,7 +121,7 @@ async def youtube_command(client: Client, message: Message):
 
 # YouTube link detection
 @Client.on_message(
-    filters.regex(YT_LINK_REGEX)
+    filters.regex(YT_LINK_RE)
     & filters.text
     & ~filters.bot
     & is_download_rate_limited
@@ -115,30 +142,27 @@ async def youtube_callback_handler(client: Client, callback_query: CallbackQuery
 @Client.on_message(filters.command(["ytstats"]) & is_rate_limited)
 async def yt_stats_command(client: Client, message: Message):
     """Show statistics about the YouTube downloader"""
-    from src.helpers.dlp.yt_dl.catch import callback_cache, video_info_cache
+    from src.helpers.dlp.yt_dl.catch import video_info_cache
 
     # Get stats
-    total_callback_cache = len(callback_cache)
     total_video_cache = len(video_info_cache)
 
     # Check temp directory
-    download_path = "./tmp"
     temp_files = 0
     total_size_mb = 0
 
     try:
-        if os.path.exists(download_path):
-            for filename in os.listdir(download_path):
-                file_path = os.path.join(download_path, filename)
-                if os.path.isfile(file_path):
-                    temp_files += 1
-                    total_size_mb += os.path.getsize(file_path) / (1024 * 1024)
+        temp_files, total_bytes = await asyncio.to_thread(
+            _sync_tmpdir_usage, DOWNLOAD_PATH
+        )
+        total_size_mb = total_bytes / (1024 * 1024)
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logger.error(f"Error checking temp directory: {e}")
 
     stats_message = (
         "📊 **YouTube Downloader Stats**\n\n"
-        f"• Cached callbacks: {total_callback_cache}\n"
         f"• Cached video info: {total_video_cache}\n"
         f"• Temporary files: {temp_files}\n"
         f"• Disk usage: {total_size_mb:.2f} MB\n\n"
@@ -0,0 +1,100 @@
+# File: tests/test_callback_data.py
+#  Copyright (c) 2025 Rkgroup.
+#  Quick Dl is an open-source Downloader bot licensed under MIT.
+#  All rights reserved where applicable.
+#
+#
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyrogram")
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Telegram rejects buttons whose callback_data exceeds 64 bytes
+MAX_CALLBACK_DATA = 64
+
+VIDEO_ID = "dQw4w9WgXcQ"  # YouTube IDs are always 11 characters
+# Longest format IDs yt-dlp reports for YouTube, plus headroom for merged ones
+FORMAT_IDS = ("18", "251-drc", "616", "sb0", "137+140", "399-dash-drc+251-drc")
+FTYPES = ("all", "video", "audio")
+
+
+def _load_utils():
+    """
+    Load yt_dl/utils.py on its own. Importing it through the src package
+    would run src/__init__.py, which starts the bot.
+    """
+    for name, path in (
+        ("src", ROOT / "src"),
+        ("src.helpers", ROOT / "src" / "helpers"),
+        ("src.helpers.dlp", ROOT / "src" / "helpers" / "dlp"),
+    ):
+        if name not in sys.modules:
+            package = types.ModuleType(name)
+            package.__path__ = [str(path)]
+            sys.modules[name] = package
+
+    spec = importlib.util.spec_from_file_location(
+        "yt_dl_utils", ROOT / "src" / "helpers" / "dlp" / "yt_dl" / "utils.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+utils = _load_utils()
+
+
+def _callback_data(buttons):
+    return [button.callback_data for row in buttons for button in row]
+
+
+@pytest.mark.parametrize("ftype", FTYPES)
+@pytest.mark.parametrize("format_id", FORMAT_IDS)
+def test_packed_callback_data_fits(format_id, ftype):
+    # Enough formats for a three-digit page count on the page buttons
+    formats = [{"format_id": format_id, "vcodec": "none"}] * 600
+    pages = (len(formats) + 4) // 5
+
+    for page in (0, pages // 2, pages - 1):
+        buttons = utils.generate_format_buttons(
+            formats, video_id=VIDEO_ID, page=page, ftype=ftype
+        )
+        for data in _callback_data(buttons):
+            assert len(data.encode()) <= MAX_CALLBACK_DATA, data
+
+
+@pytest.mark.parametrize("format_id", FORMAT_IDS)
+def test_repacked_format_payload_fits(format_id):
+    # callback.py re-packs the "<video_id>|<format_id>" field of a ytdl_
+    # button into its confirm and queue buttons
+    buttons = utils.generate_format_buttons(
+        [{"format_id": format_id, "vcodec": "none"}], video_id=VIDEO_ID
+    )
+    packed = buttons[0][0].callback_data
+    assert packed == f"ytdl_{VIDEO_ID}{utils.CALLBACK_SEP}{format_id}"
+
+    fields = packed.split("_", 1)[1]
+    video_id, fid = fields.split(utils.CALLBACK_SEP)
+    for data in (f"ytdlconfirm_{fields}", f"ytqueueformat_{video_id}:{fid}"):
+        assert len(data.encode()) <= MAX_CALLBACK_DATA, data
+
+
+@pytest.mark.parametrize("ftype", FTYPES)
+def test_page_buttons_carry_filter(ftype):
+    formats = [{"format_id": "18", "vcodec": "none"}] * 12
+    buttons = utils.generate_format_buttons(
+        formats, video_id=VIDEO_ID, page=1, ftype=ftype
+    )
+    sep = utils.CALLBACK_SEP
+    pages = [d for d in _callback_data(buttons) if d.startswith("ytpage_")]
+    assert pages == [
+        f"ytpage_{VIDEO_ID}{sep}{ftype}{sep}0",
+        f"ytpage_{VIDEO_ID}{sep}{ftype}{sep}2",
+    ]